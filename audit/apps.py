@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.core.signals import setting_changed
+
+
+def reset_diff_profiles(setting, **kwargs):
+    if setting == "AUDIT_DIFF_PROFILES":
+        from .services.audit_service import load_diff_profiles
+        load_diff_profiles.cache_clear()
 
 
 class AuditConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'audit'
+
+    def ready(self):
+        from .services.audit_service import load_diff_profiles
+        # Validate AUDIT_DIFF_PROFILES at startup instead of on the first event
+        load_diff_profiles()
+        setting_changed.connect(reset_diff_profiles)
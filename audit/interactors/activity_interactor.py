@@ -1,10 +1,11 @@
 import logging
 from typing import List
-from ..services.audit_service import compute_diff, generate_summary, verb_map
+from ..services.audit_service import summary_is_lazy, verb_map
 from ..services.validation_service import ValidationService
 from ..services.actor_service import ActorService
 from ..services.resource_service import ResourceService
 from ..services.history_service import HistoryService
+from ..services.diff_service import DiffService
 from ..services.response_service import ResponseService
 
 logger = logging.getLogger(__name__)
@@ -14,13 +15,17 @@ class ActivityInteractor:
     """Interactor for orchestrating the activity processing flow - only interaction logic"""
 
     @staticmethod
-    def process_payloads(payloads):
+    def process_payloads(payloads, render_summary: bool = None, response_mode: str = "full"):
         """
         Process payloads - orchestration only, delegates to services.
-        
+
         Args:
             payloads: Single payload dict or list of payload dicts
-            
+            render_summary: Include the summary in responses; defaults to True unless
+                AUDIT_SUMMARY_MODE is "lazy"
+            response_mode: "full" echoes changes, actor and summary; "minimal" returns only
+                event id, version and change count per item
+
         Returns:
             List of response dictionaries
         """
@@ -28,57 +33,96 @@ class ActivityInteractor:
         if isinstance(payloads, dict):
             payloads = [payloads]
 
-        result = []
-        for payload in payloads:
-            # Step 1: Validate payload - delegates to ValidationService
-            validated, payload_type = ValidationService.validate(payload)
-            logger.info(f"Validated payload_type: {payload_type}")
-            
-            # Step 2: Extract actor - delegates to ActorService
-            actor_full, actor_id = ActorService.extract_actor(payload, validated, payload_type)
-            logger.info(f"Extracted actor_full: {actor_full}, actor_id: {actor_id}")
-            
-            # Step 3: Extract resource - delegates to ResourceService
-            res_id, res_type, data = ResourceService.extract_resource(payload, validated, payload_type)
-            logger.info(f"Extracted res_id: {res_id}, res_type: {res_type}, data: {data}")
-            
-            # Step 4: Get verb mapping from audit_service
-            verb_raw = payload.get("verb", "updated").lower().strip()
-            verb = verb_map.get(verb_raw, "updated")
-            logger.info(f"Verb mapped: {verb_raw} -> {verb}")
-
-            # Step 5: Validate resource type required for create/update
-            if res_type == "unknown" and verb not in ["deleted", "delete"]:
-                raise ValueError("Resource type is required for create/update")
-
-            # Step 6: Get last history - delegates to HistoryService
-            last = HistoryService.get_last_history(res_type, res_id)
-            logger.info(f"Last history: {last}")
-            
-            # Step 7: Compute diff using audit_service
-            old = last.full_fields_after if last else {}
-            logger.info(f"Old data (full_fields_after): {old}")
-            logger.info(f"New data (data): {data}")
-            changes = compute_diff(old, data)
+        lazy_summary = summary_is_lazy()
+        if render_summary is None:
+            render_summary = not lazy_summary
+        if response_mode == "minimal":
+            render_summary = False
+
+        # Steps 1-5: Validate and extract every payload
+        events = [ActivityInteractor.prepare_event(payload) for payload in payloads]
+
+        # Step 6: Get last history for all resources at once - delegates to HistoryService
+        last_by_key = HistoryService.get_last_histories((e["res_type"], e["res_id"]) for e in events)
+        logger.info(f"Last history found for {len(last_by_key)} of {len(events)} events")
+
+        # Resolve previous state; a resource repeated in the batch diffs against its earlier event
+        state = {key: (last.full_fields_after, last.version) for key, last in last_by_key.items()}
+        for event in events:
+            key = (event["res_type"], event["res_id"])
+            old, last_version = state.get(key, ({}, 0))
+            event["old"] = old
+            event["version"] = last_version + 1
+            state[key] = (event["data"], event["version"])
+
+        # Step 7: Compute diffs and summaries - delegates to DiffService (inline or process pool)
+        computed = DiffService.compute_many(
+            [(e["old"], e["data"], e["res_type"]) for e in events],
+            with_summary=not lazy_summary or render_summary,
+        )
+        for event, (changes, summary) in zip(events, computed):
             logger.info(f"Computed changes: {changes}")
-            summary = generate_summary(changes)
-
-            # Step 8: Create history record - delegates to HistoryService
-            HistoryService.create_history(
-                res_type=res_type,
-                res_id=res_id,
-                operation=verb,
-                actor_full=actor_full,
-                actor_id=actor_id,
-                changes=changes,
-                summary=summary,
-                data=data,
-                last_version=last.version if last else None
-            )
+            event["changes"] = changes
+            event["summary"] = summary
+
+        # Step 8: Create history records in one transaction - delegates to HistoryService
+        # In lazy mode the summary is derived from `changes` on read (AuditHistory.get_summary)
+        histories = HistoryService.bulk_create_histories([
+            {**event, "summary": "" if lazy_summary else event["summary"]} for event in events
+        ])
+
+        # Step 9: Build response - delegates to ResponseService
+        if response_mode == "minimal":
+            return [ResponseService.build_minimal_response(history) for history in histories]
 
-            # Step 9: Build response - delegates to ResponseService
-            response = ResponseService.build_response(actor_full, res_id, res_type, changes, summary)
-            response["verb"] = verb
+        result = []
+        for event in events:
+            response = ResponseService.build_response(
+                event["actor_full"], event["res_id"], event["res_type"], event["changes"],
+                event["summary"] if render_summary else None
+            )
+            response["verb"] = event["operation"]
             result.append(response)
 
         return result
+
+    @staticmethod
+    def prepare_event(payload) -> dict:
+        """
+        Validate a payload and extract actor, resource and verb - delegates to services.
+
+        Args:
+            payload: Single payload dict
+
+        Returns:
+            Dict with actor_full, actor_id, res_id, res_type, data and operation
+        """
+        # Step 1: Validate payload - delegates to ValidationService
+        validated, payload_type = ValidationService.validate(payload)
+        logger.info(f"Validated payload_type: {payload_type}")
+
+        # Step 2: Extract actor - delegates to ActorService
+        actor_full, actor_id = ActorService.extract_actor(payload, validated, payload_type)
+        logger.info(f"Extracted actor_full: {actor_full}, actor_id: {actor_id}")
+
+        # Step 3: Extract resource - delegates to ResourceService
+        res_id, res_type, data = ResourceService.extract_resource(payload, validated, payload_type)
+        logger.info(f"Extracted res_id: {res_id}, res_type: {res_type}, data: {data}")
+
+        # Step 4: Get verb mapping from audit_service
+        verb_raw = payload.get("verb", "updated").lower().strip()
+        verb = verb_map.get(verb_raw, "updated")
+        logger.info(f"Verb mapped: {verb_raw} -> {verb}")
+
+        # Step 5: Validate resource type required for create/update
+        if res_type == "unknown" and verb not in ["deleted", "delete"]:
+            raise ValueError("Resource type is required for create/update")
+
+        return {
+            "actor_full": actor_full,
+            "actor_id": actor_id,
+            "res_id": res_id,
+            "res_type": res_type,
+            "data": data,
+            "operation": verb,
+        }
@@ -0,0 +1,135 @@
+import logging
+import time
+from django.conf import settings
+from django.db import DataError, close_old_connections
+from .activity_interactor import ActivityInteractor
+from ..services.claim_check_service import ClaimCheckService
+
+logger = logging.getLogger(__name__)
+
+# Errors that will fail again on every retry (pydantic's ValidationError is a ValueError);
+# everything else (OperationalError, IntegrityError, ...) is treated as transient
+PERMANENT_ERRORS = (ValueError, DataError)
+
+
+class MicroBatcher:
+    """Buffers activity task messages and flushes them through one batched ActivityInteractor cycle"""
+
+    def __init__(self, max_events: int = None, max_wait_ms: int = None):
+        self.max_events = max_events or getattr(settings, "AUDIT_MICROBATCH_MAX_EVENTS", 500)
+        self.max_wait = (max_wait_ms or getattr(settings, "AUDIT_MICROBATCH_MAX_WAIT_MS", 200)) / 1000
+        self.retry_backoff = getattr(settings, "AUDIT_MICROBATCH_RETRY_BACKOFF_SECONDS", 1)
+        self.retry_backoff_max = getattr(settings, "AUDIT_MICROBATCH_RETRY_BACKOFF_MAX_SECONDS", 60)
+        self.pending = []  # (message, payload list, claim check reference)
+        self.event_count = 0
+        self.first_added_at = None
+        self.transient_failures = 0
+        self.stats = {
+            "batches": 0,
+            "messages": 0,
+            "events": 0,
+            "failed_messages": 0,
+            "requeued_messages": 0,
+            "fill_ratio_sum": 0.0,
+        }
+
+    def add(self, message, payloads, claim_check: str = None):
+        """
+        Buffer one message; flushes when max_events is reached.
+
+        Args:
+            message: Broker message exposing ack() and reject(requeue=...)
+            payloads: The process_activity_task payloads (dict or list)
+            claim_check: Claim check reference to delete once the message is acked
+        """
+        payloads = [payloads] if isinstance(payloads, dict) else list(payloads)
+        if not self.pending:
+            self.first_added_at = time.monotonic()
+        self.pending.append((message, payloads, claim_check))
+        self.event_count += len(payloads)
+        if self.event_count >= self.max_events:
+            self.flush(reason="size")
+
+    def time_left(self):
+        """Seconds until the buffer must be flushed, or None when it is empty."""
+        if not self.pending:
+            return None
+        return max(0.0, self.first_added_at + self.max_wait - time.monotonic())
+
+    def flush(self, reason: str = "timeout"):
+        """Process all buffered events in one cycle and ack their messages only afterwards."""
+        if not self.pending:
+            return
+        pending, event_count = self.pending, self.event_count
+        self.pending, self.event_count, self.first_added_at = [], 0, None
+
+        events = [payload for _, payloads, _ in pending for payload in payloads]
+        try:
+            ActivityInteractor.process_payloads(events, response_mode="minimal")
+        except PERMANENT_ERRORS as exc:
+            # The batch insert is atomic, so nothing was written - retry message by message
+            # to isolate the bad ones
+            logger.error(f"Micro-batch of {len(pending)} messages failed, processing individually: {exc}")
+            self.flush_individually(pending)
+        except Exception as exc:
+            logger.error(f"Micro-batch of {len(pending)} messages failed with a transient error: {exc}")
+            self.requeue([message for message, _, _ in pending])
+        else:
+            self.transient_failures = 0
+            for message, _, claim_check in pending:
+                self.ack(message, claim_check)
+
+        fill_ratio = min(event_count / self.max_events, 1.0)
+        self.stats["batches"] += 1
+        self.stats["messages"] += len(pending)
+        self.stats["events"] += event_count
+        self.stats["fill_ratio_sum"] += fill_ratio
+        logger.info(
+            f"Micro-batch flushed ({reason}): messages={len(pending)} events={event_count} "
+            f"fill_ratio={fill_ratio:.2f} avg_fill_ratio={self.average_fill_ratio():.2f}"
+        )
+
+    def flush_individually(self, pending):
+        requeue = []
+        for message, payloads, claim_check in pending:
+            try:
+                ActivityInteractor.process_payloads(payloads, response_mode="minimal")
+            except PERMANENT_ERRORS as exc:
+                logger.error(f"Activity processing failed, message rejected: {exc}")
+                self.stats["failed_messages"] += 1
+                message.reject(requeue=False)
+            except Exception as exc:
+                logger.error(f"Activity processing failed with a transient error, message requeued: {exc}")
+                requeue.append(message)
+            else:
+                self.ack(message, claim_check)
+        if requeue:
+            self.requeue(requeue)
+        else:
+            self.transient_failures = 0
+
+    def requeue(self, messages):
+        """Back off exponentially, then hand the messages back to the broker for redelivery."""
+        self.transient_failures += 1
+        # Drop a connection broken by e.g. an OperationalError so the next flush reconnects
+        close_old_connections()
+        self.backoff()
+        for message in messages:
+            message.reject(requeue=True)
+        self.stats["requeued_messages"] += len(messages)
+
+    def backoff(self):
+        if not self.transient_failures:
+            return
+        delay = min(self.retry_backoff * 2 ** (self.transient_failures - 1), self.retry_backoff_max)
+        logger.warning(f"Backing off {delay:.1f}s after {self.transient_failures} transient failure(s)")
+        time.sleep(delay)
+
+    @staticmethod
+    def ack(message, claim_check: str = None):
+        message.ack()
+        if claim_check:
+            ClaimCheckService.delete(claim_check)
+
+    def average_fill_ratio(self) -> float:
+        return self.stats["fill_ratio_sum"] / self.stats["batches"] if self.stats["batches"] else 0.0
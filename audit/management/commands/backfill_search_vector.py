@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from audit.models import AuditHistory
+
+
+class Command(BaseCommand):
+    help = "Fill AuditHistory.search_vector for existing rows in small id-range chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows (id range) per transaction")
+        parser.add_argument("--sleep", type=float, default=0.1, help="Seconds to pause between chunks")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        bounds = AuditHistory.objects.filter(search_vector__isnull=True).aggregate(low=Min("id"), high=Max("id"))
+        if bounds["low"] is None:
+            self.stdout.write(self.style.SUCCESS("Nothing to backfill"))
+            return
+
+        updated = 0
+        for start in range(bounds["low"], bounds["high"] + 1, chunk_size):
+            # Touching summary fires the search_vector trigger; one short transaction per chunk
+            # keeps row locks brief
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE audit_audithistory SET summary = summary "
+                    "WHERE id >= %s AND id < %s AND search_vector IS NULL",
+                    [start, start + chunk_size],
+                )
+                updated += cursor.rowcount
+            self.stdout.write(f"Backfilled ids {start}..{start + chunk_size - 1} ({updated} rows)")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill finished: {updated} rows"))
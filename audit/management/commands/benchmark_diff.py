@@ -0,0 +1,58 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.core.management.base import BaseCommand
+from audit.services.diff_service import DiffService
+
+
+class Command(BaseCommand):
+    help = "Benchmark diff/summary computation inline vs. process pools of increasing size"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=64, help="Number of events in the batch")
+        parser.add_argument("--fields", type=int, default=2000, help="Leaf fields per document")
+        parser.add_argument("--change-ratio", type=float, default=0.1, help="Fraction of fields changed per update")
+        parser.add_argument("--workers", type=str, default=None,
+                            help="Comma separated pool sizes (default: 1,2,4,... up to CPU count)")
+
+    def handle(self, *args, **options):
+        items = self.build_items(options["events"], options["fields"], options["change_ratio"])
+        cpu_count = os.cpu_count() or 1
+        if options["workers"]:
+            worker_counts = [int(w) for w in options["workers"].split(",")]
+        else:
+            worker_counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= cpu_count]
+
+        self.stdout.write(
+            f"cpus={cpu_count} events={options['events']} fields={options['fields']} "
+            f"change_ratio={options['change_ratio']}"
+        )
+        start = time.perf_counter()
+        DiffService.compute_many(items)
+        inline = time.perf_counter() - start
+        self.stdout.write(f"inline      {inline:8.3f}s  1.00x")
+
+        for workers in worker_counts:
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+                # Warm the workers so process start-up is not measured
+                list(pool.map(abs, range(workers)))
+                start = time.perf_counter()
+                DiffService.compute_many(items, executor=pool)
+                elapsed = time.perf_counter() - start
+            self.stdout.write(f"{workers:3d} workers {elapsed:8.3f}s  {inline / elapsed:.2f}x")
+
+    @staticmethod
+    def build_items(events: int, fields: int, change_ratio: float) -> list:
+        rnd = random.Random(42)
+        items = []
+        for n in range(events):
+            old = {f"section{i % 20}": {} for i in range(min(fields, 20))}
+            for i in range(fields):
+                old[f"section{i % 20}"][f"field{i}"] = rnd.randint(0, 1000)
+            new = {section: dict(values) for section, values in old.items()}
+            for i in rnd.sample(range(fields), int(fields * change_ratio)):
+                new[f"section{i % 20}"][f"field{i}"] = rnd.randint(1001, 2000)
+            items.append((old, new, "benchmark"))
+        return items
@@ -0,0 +1,106 @@
+import logging
+import socket
+from django.core.management.base import BaseCommand
+from kombu import Queue
+from auditHistory.celery import app
+from audit.interactors.micro_batcher import MicroBatcher, PERMANENT_ERRORS
+from audit.services.claim_check_service import ClaimCheckService
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_TASK = "audit.tasks.process_activity_task"
+
+
+class Command(BaseCommand):
+    help = "Consume audit_log_queue and process activity tasks in micro-batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", type=str, default="audit_log_queue", help="Queue to consume")
+        parser.add_argument("--max-events", type=int, default=None,
+                            help="Flush after this many events (AUDIT_MICROBATCH_MAX_EVENTS)")
+        parser.add_argument("--max-wait-ms", type=int, default=None,
+                            help="Flush after the oldest buffered message waited this long (AUDIT_MICROBATCH_MAX_WAIT_MS)")
+        parser.add_argument("--stats-every", type=int, default=100, help="Log aggregate stats every N batches")
+
+    def handle(self, *args, **options):
+        self.batcher = MicroBatcher(options["max_events"], options["max_wait_ms"])
+        stats_every = options["stats_every"]
+        idle_timeout = 1.0
+        logged_batches = 0
+
+        with app.connection_for_read() as conn:
+            consumer = conn.Consumer(
+                Queue(options["queue"]),
+                callbacks=[self.on_message],
+                accept=app.conf.accept_content or ["json"],
+                # Every buffered message stays unacked until its batch is flushed
+                prefetch_count=self.batcher.max_events,
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Consuming {options['queue']} (max_events={self.batcher.max_events}, "
+                f"max_wait={self.batcher.max_wait * 1000:.0f}ms)"
+            ))
+            with consumer:
+                try:
+                    while True:
+                        time_left = self.batcher.time_left()
+                        try:
+                            conn.drain_events(timeout=idle_timeout if time_left is None else max(time_left, 0.001))
+                        except socket.timeout:
+                            pass
+                        if self.batcher.time_left() == 0:
+                            self.batcher.flush(reason="timeout")
+                        if self.batcher.stats["batches"] - logged_batches >= stats_every:
+                            logged_batches = self.batcher.stats["batches"]
+                            self.log_stats()
+                except KeyboardInterrupt:
+                    self.batcher.flush(reason="shutdown")
+                    self.log_stats()
+
+    def on_message(self, body, message):
+        task_name = message.headers.get("task") if message.headers else None
+        if task_name is None and isinstance(body, dict):  # task message protocol 1
+            task_name = body.get("task")
+            args, kwargs = body.get("args", []), body.get("kwargs", {})
+        else:  # protocol 2: (args, kwargs, embed)
+            args, kwargs = body[0], body[1]
+
+        if task_name == ACTIVITY_TASK:
+            payloads = args[0] if args else kwargs.get("payloads")
+            claim_check = kwargs.get("claim_check")
+            if claim_check:
+                try:
+                    payloads = ClaimCheckService.fetch(claim_check)
+                except KeyError:
+                    logger.error(f"Claim check {claim_check} not found, message rejected")
+                    message.reject(requeue=False)
+                    return
+            self.batcher.add(message, payloads or [], claim_check)
+            return
+
+        # Anything else routed to this queue runs as a regular task. Beat tasks such as the rollup
+        # refresh can run for many seconds, so buffered messages are flushed and acked first
+        self.batcher.flush(reason="task")
+        if task_name not in app.tasks:
+            logger.error(f"Unknown task {task_name}, message rejected")
+            message.reject(requeue=False)
+            return
+        try:
+            app.tasks[task_name](*args, **kwargs)
+        except PERMANENT_ERRORS as exc:
+            logger.error(f"Task {task_name} failed, message rejected: {exc}")
+            message.reject(requeue=False)
+        except Exception as exc:
+            logger.error(f"Task {task_name} failed with a transient error, message requeued: {exc}")
+            self.batcher.requeue([message])
+        else:
+            self.batcher.transient_failures = 0
+            message.ack()
+
+    def log_stats(self):
+        stats = self.batcher.stats
+        self.stdout.write(
+            f"batches={stats['batches']} messages={stats['messages']} events={stats['events']} "
+            f"failed_messages={stats['failed_messages']} requeued_messages={stats['requeued_messages']} "
+            f"avg_fill_ratio={self.batcher.average_fill_ratio():.2f}"
+        )
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 import json
-from audit.tasks import process_activity_task
+from audit.tasks import enqueue_activity
 
 
 class Command(BaseCommand):
@@ -20,6 +20,6 @@ class Command(BaseCommand):
         with open(file_path, "r") as f:
             data = json.load(f)
 
-        process_activity_task.delay(data)
+        enqueue_activity(data)
 
         self.stdout.write(self.style.SUCCESS("Task sent to Celery"))
@@ -0,0 +1,184 @@
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from audit.interactors.activity_interactor import ActivityInteractor
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = "Replay an NDJSON event file (or a synthesized skewed workload) against the activity-stream pipeline"
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--file", type=str, help="NDJSON file, one payload (or list of payloads) per line")
+        source.add_argument("--synthesize", type=int, help="Number of events to generate instead of reading a file")
+
+        parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess",
+                            help="Call ActivityInteractor directly or POST to --url")
+        parser.add_argument("--url", type=str, default="http://localhost:8000/audit/activity-stream/?response=minimal",
+                            help="Activity stream endpoint for --mode http")
+        parser.add_argument("--concurrency", type=int, default=4, help="Parallel senders")
+        parser.add_argument("--rate", type=float, default=0, help="Target events/second (0 = as fast as possible)")
+        parser.add_argument("--batch-size", type=int, default=1, help="Events per request/interactor call")
+
+        # Synthetic workload shape
+        parser.add_argument("--resources", type=int, default=1000, help="Distinct resources")
+        parser.add_argument("--hot-resources", type=int, default=10, help="Resources receiving --hot-ratio of events")
+        parser.add_argument("--hot-ratio", type=float, default=0.8, help="Fraction of events hitting hot resources")
+        parser.add_argument("--fields", type=int, default=20, help="Fields per regular document")
+        parser.add_argument("--large-fields", type=int, default=2000, help="Fields per large document")
+        parser.add_argument("--large-ratio", type=float, default=0.05, help="Fraction of large documents")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options["file"]:
+            events = self.read_events(options["file"])
+        else:
+            events = self.synthesize(options)
+        if not events:
+            raise CommandError("No events to replay")
+
+        batch_size = max(1, options["batch_size"])
+        batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+        send = self.send_http if options["mode"] == "http" else self.send_inprocess
+        self.url = options["url"]
+
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = Counter()
+        self.queries = 0
+        self.ok_events = 0
+
+        rate = options["rate"]
+        pending = iter(enumerate(batches))
+        started = time.perf_counter()
+
+        def worker():
+            try:
+                while True:
+                    with self.lock:
+                        index, batch = next(pending, (None, None))
+                    if batch is None:
+                        return
+                    if rate:
+                        # Pace batches against a global schedule so the aggregate rate matches --rate
+                        delay = started + index * batch_size / rate - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    send(batch)
+            finally:
+                connection.close()  # each sender thread keeps one DB connection for the whole run
+
+        threads = [threading.Thread(target=worker) for _ in range(max(1, options["concurrency"]))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        self.report(len(events), len(batches), elapsed, options)
+
+    def send_inprocess(self, batch):
+        start = time.perf_counter()
+        try:
+            with CaptureQueriesContext(connection) as captured:
+                ActivityInteractor.process_payloads(batch, response_mode="minimal")
+        except Exception as exc:
+            # Prefer the driver's error class (UniqueViolation, DeadlockDetected) over Django's wrapper
+            self.record(batch, time.perf_counter() - start, error=type(exc.__cause__ or exc).__name__)
+        else:
+            self.record(batch, time.perf_counter() - start, queries=len(captured))
+
+    def send_http(self, batch):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(batch).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+        except urllib.error.HTTPError as exc:
+            self.record(batch, time.perf_counter() - start, error=f"HTTP {exc.code}")
+        except OSError as exc:
+            self.record(batch, time.perf_counter() - start, error=type(exc).__name__)
+        else:
+            self.record(batch, time.perf_counter() - start)
+
+    def record(self, batch, latency: float, error: str = None, queries: int = 0):
+        with self.lock:
+            self.latencies.append(latency)
+            if error:
+                self.errors[error] += len(batch)
+            else:
+                self.ok_events += len(batch)
+                self.queries += queries
+
+    def report(self, total_events: int, total_batches: int, elapsed: float, options):
+        latencies = sorted(self.latencies)
+        lines = [
+            f"mode={options['mode']} concurrency={options['concurrency']} batch_size={options['batch_size']} "
+            f"target_rate={options['rate'] or 'max'}",
+            f"events={total_events} batches={total_batches} ok={self.ok_events} "
+            f"failed={sum(self.errors.values())} elapsed={elapsed:.2f}s",
+            f"throughput={self.ok_events / elapsed:.1f} events/s",
+            "latency per batch: "
+            f"p50={percentile(latencies, 50) * 1000:.1f}ms "
+            f"p95={percentile(latencies, 95) * 1000:.1f}ms "
+            f"p99={percentile(latencies, 99) * 1000:.1f}ms "
+            f"max={latencies[-1] * 1000:.1f}ms",
+        ]
+        if options["mode"] == "inprocess" and self.ok_events:
+            lines.append(f"db queries per event={self.queries / self.ok_events:.2f}")
+        for error, count in self.errors.most_common():
+            lines.append(f"error {error}: {count} events")
+        self.stdout.write("\n".join(lines))
+
+    @staticmethod
+    def read_events(file_path: str) -> list:
+        events = []
+        with open(file_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                events.extend(item if isinstance(item, list) else [item])
+        return events
+
+    @staticmethod
+    def synthesize(options) -> list:
+        """Skewed workload: --hot-ratio of events go to --hot-resources, --large-ratio are large documents."""
+        rnd = random.Random(options["seed"])
+        hot = max(1, min(options["hot_resources"], options["resources"]))
+        events = []
+        for _ in range(options["synthesize"]):
+            if rnd.random() < options["hot_ratio"]:
+                resource = rnd.randrange(hot)
+            else:
+                resource = rnd.randrange(options["resources"])
+            fields = options["large_fields"] if rnd.random() < options["large_ratio"] else options["fields"]
+            document = {f"field{i}": rnd.randint(0, 100) for i in range(fields)}
+            events.append({
+                "actor": {"id": f"loadtest-{rnd.randrange(50)}"},
+                "verb": "update",
+                "object": {"id": f"resource-{resource}", "type": "load_test", **document},
+            })
+        return events
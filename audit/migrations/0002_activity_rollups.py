@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-19 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=10)),
+                ('bucket', models.DateTimeField()),
+                ('resource_type', models.CharField(max_length=100)),
+                ('operation', models.CharField(max_length=20)),
+                ('actor_id', models.CharField(blank=True, default='', max_length=255)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'audit_activityrollup',
+                'indexes': [models.Index(fields=['granularity', 'actor_id', 'bucket'], name='audit_activ_granula_f5341c_idx')],
+                'unique_together': {('granularity', 'bucket', 'resource_type', 'operation', 'actor_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityRollupDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('resource_type', models.CharField(max_length=100)),
+                ('operation', models.CharField(max_length=20)),
+                ('actor_id', models.CharField(blank=True, default='', max_length=255)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'audit_activityrollupdelta',
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+# search_vector is filled by a trigger instead of a STORED generated column: adding a generated
+# column rewrites the whole table under an exclusive lock, while a nullable column is metadata
+# only and existing rows are filled in chunks by `manage.py backfill_search_vector`.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION audit_audithistory_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'A') ||
+        setweight(jsonb_to_tsvector('english', coalesce(NEW.changes, '{}'::jsonb), '["key", "string", "numeric"]'), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER audit_audithistory_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF summary, changes ON audit_audithistory
+    FOR EACH ROW EXECUTE FUNCTION audit_audithistory_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS audit_audithistory_search_vector_trigger ON audit_audithistory;
+DROP FUNCTION IF EXISTS audit_audithistory_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('audit', '0002_activity_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audithistory',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        AddIndexConcurrently(
+            model_name='audithistory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='audit_history_search_gin'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('audit', '0003_audithistory_search_vector'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='audithistory',
+            index=models.Index(fields=['event_id'], name='audit_history_event_id_idx'),
+        ),
+    ]
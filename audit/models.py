@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 import uuid
 from django.utils import timezone
@@ -14,15 +16,65 @@ class AuditHistory(models.Model):
     changes           = models.JSONField(default=dict)
     summary           = models.TextField(blank=True)
     full_fields_after = models.JSONField(default=dict, blank=True)
+    # Maintained by a database trigger from summary and changes (migration 0003)
+    search_vector     = SearchVectorField(null=True, editable=False)
 
     class Meta:
         indexes = [
             models.Index(fields=['resource_type', 'resource_id', '-version']),
             models.Index(fields=['-timestamp']),
+            models.Index(fields=['event_id'], name='audit_history_event_id_idx'),
+            GinIndex(fields=['search_vector'], name='audit_history_search_gin'),
         ]
         unique_together = [['resource_type', 'resource_id', 'version']]
         ordering = ['-timestamp']
         db_table = 'audit_audithistory' 
 
+    def get_summary(self) -> str:
+        """Stored summary, or one rendered from `changes` when summaries are lazy."""
+        if self.summary:
+            return self.summary
+        from .services.audit_service import generate_summary
+        return generate_summary(self.changes, self.resource_type)
+
+    def __str__(self):
+        return f"{self.resource_type} {self.resource_id} v{self.version}"
+
+
+class ActivityRollup(models.Model):
+    """Incrementally maintained event counts per time bucket, resource type and operation."""
+    GRANULARITY_HOUR = "hour"
+    GRANULARITY_DAY = "day"
+    GRANULARITY_CHOICES = [(GRANULARITY_HOUR, "Hour"), (GRANULARITY_DAY, "Day")]
+
+    granularity   = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket        = models.DateTimeField()
+    resource_type = models.CharField(max_length=100)
+    operation     = models.CharField(max_length=20)
+    actor_id      = models.CharField(max_length=255, blank=True, default="")  # "" = all actors
+    count         = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['granularity', 'actor_id', 'bucket']),
+        ]
+        unique_together = [['granularity', 'bucket', 'resource_type', 'operation', 'actor_id']]
+        db_table = 'audit_activityrollup'
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket:%Y-%m-%d %H:00} {self.resource_type} {self.operation}: {self.count}"
+
+
+class ActivityRollupDelta(models.Model):
+    """Hourly counts written with each history batch and not yet folded into ActivityRollup."""
+    bucket        = models.DateTimeField()
+    resource_type = models.CharField(max_length=100)
+    operation     = models.CharField(max_length=20)
+    actor_id      = models.CharField(max_length=255, blank=True, default="")  # "" unless AUDIT_ROLLUP_BY_ACTOR
+    count         = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'audit_activityrollupdelta'
+
     def __str__(self):
-        return f"{self.resource_type} {self.resource_id} v{self.version}"
\ No newline at end of file
+        return f"{self.bucket:%Y-%m-%d %H:00} {self.resource_type} {self.operation}: +{self.count}"
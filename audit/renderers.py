@@ -0,0 +1,54 @@
+import io
+import re
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency - fall back to DRF's json based classes
+    orjson = None
+
+# orjson turns integers outside the 64-bit range into floats; any run of 19+ digits may be one
+LONG_DIGIT_RUN = re.compile(rb'\d{19}')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson when it is installed."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        # DRF's encoder covers the types orjson does not (Decimal, lazy strings, querysets, ...)
+        try:
+            return orjson.dumps(data, default=JSONEncoder().default, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the json module renders exactly
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson when it is installed.
+
+    Bodies that may hold integers beyond 64 bits are parsed with the json module instead, so
+    submitted values are stored exactly rather than rounded to floats.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if LONG_DIGIT_RUN.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -6,3 +6,4 @@ from .activity import (
 
 from .actor import Actor
 from .resource import ResourceRef
+from .diff_profile import DiffProfile
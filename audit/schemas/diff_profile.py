@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+# Per resource type diff settings, configured in AUDIT_DIFF_PROFILES
+class DiffProfile(BaseModel):
+    # Dotted paths dropped before diffing/storing; "*" matches any single key
+    ignore_paths: List[str] = Field(default_factory=list)
+    # Dotted paths whose subtree is compared by hash and reported as one change
+    opaque_paths: List[str] = Field(default_factory=list)
+    # Subtrees nested deeper than this are compared by hash
+    max_depth: Optional[int] = Field(None, ge=1)
+    # Field identifying items of lists of objects, so list items are diffed by key instead of position
+    list_key: Optional[str] = None
+
+    model_config = {"extra": "forbid"}
+
+    def is_empty(self) -> bool:
+        return not (self.ignore_paths or self.opaque_paths or self.max_depth or self.list_key)
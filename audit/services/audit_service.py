@@ -1,6 +1,16 @@
+import hashlib
+import json
+from functools import lru_cache
+from itertools import islice
 from typing import Dict
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.views.decorators.csrf import csrf_exempt
 from deepdiff import DeepDiff
+from pydantic import ValidationError
+from ..schemas import DiffProfile
+
+EMPTY_DIFF_PROFILE = DiffProfile()
 
 # Utility Functions
 def flatten_dict(d: Dict, parent_key: str = '', sep: str = '.') -> Dict:
@@ -21,9 +31,100 @@ def clean_path(path: str) -> str:
     return path.strip(".")
 
 
-def compute_diff(old_data: Dict, new_data: Dict) -> Dict[str, list]:
+@lru_cache(maxsize=None)
+def load_diff_profiles() -> Dict[str, DiffProfile]:
+    """
+    Validate AUDIT_DIFF_PROFILES once; called from AuditConfig.ready() so a bad entry fails at
+    startup. The cache is cleared when the setting changes (AuditConfig.ready()).
+    """
+    configured = getattr(settings, "AUDIT_DIFF_PROFILES", {})
+    try:
+        return {res_type: DiffProfile.model_validate(profile) for res_type, profile in configured.items()}
+    except ValidationError as exc:
+        raise ImproperlyConfigured(f"Invalid AUDIT_DIFF_PROFILES: {exc}") from exc
+
+
+def get_diff_profile(resource_type: str = None) -> DiffProfile:
+    """AUDIT_DIFF_PROFILES[resource_type], falling back to the "default" profile."""
+    profiles = load_diff_profiles()
+    return profiles.get(resource_type) or profiles.get("default") or EMPTY_DIFF_PROFILE
+
+
+def opaque_digest(value) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str).encode()
+    return "sha256:" + hashlib.sha256(encoded).hexdigest()
+
+
+def _path_matches(path: tuple, patterns: list) -> bool:
+    return any(
+        len(pattern) == len(path) and all(p == "*" or p == k for p, k in zip(pattern, path))
+        for pattern in patterns
+    )
+
+
+def apply_diff_profile(data: Dict, profile: DiffProfile, for_diff: bool = True, positional: set = None) -> Dict:
+    """
+    Drop ignored paths and collapse opaque subtrees to a digest string.
+
+    With for_diff=True (compute_diff) subtrees deeper than max_depth are collapsed too and
+    lists of objects with unique list_key values are keyed by it; the stored document
+    (for_diff=False) keeps them. List items are matched by index ("*" in a path), so ignore
+    and opaque paths inside lists apply in both cases.
+
+    positional holds the paths of lists that must not be keyed; lists with repeated keys
+    are added to it so the caller can treat the other document the same way.
+    """
+    if not data or profile.is_empty():
+        return data
+    ignore = [tuple(p.split(".")) for p in profile.ignore_paths]
+    opaque = [tuple(p.split(".")) for p in profile.opaque_paths]
+    max_depth = profile.max_depth if for_diff else None
+    list_key = profile.list_key if for_diff else None
+    positional = set() if positional is None else positional
+
+    def walk(value, path, depth):
+        if isinstance(value, dict):
+            result = {}
+            for key, child in value.items():
+                child_path = path + (str(key),)
+                if ignore and _path_matches(child_path, ignore):
+                    continue
+                if isinstance(child, (dict, list)) and (
+                    (opaque and _path_matches(child_path, opaque)) or (max_depth and depth >= max_depth)
+                ):
+                    result[key] = opaque_digest(child)
+                else:
+                    result[key] = walk(child, child_path, depth + 1)
+            return result
+        if isinstance(value, list):
+            if list_key and value and path not in positional and all(
+                isinstance(item, dict) and list_key in item for item in value
+            ):
+                keyed = {str(item[list_key]): item for item in value}
+                # Repeated keys would silently drop items, so those lists are diffed by position
+                if len(keyed) == len(value):
+                    return walk(keyed, path, depth)
+                positional.add(path)
+            return [walk(item, path + (str(index),), depth + 1) for index, item in enumerate(value)]
+        return value
+
+    return walk(data, (), 1)
+
+
+def compute_diff(old_data: Dict, new_data: Dict, resource_type: str = None) -> Dict[str, list]:
     changes = {}
 
+    profile = get_diff_profile(resource_type)
+    # A list diffed by position in one document must be diffed by position in the other too
+    positional = set()
+    while True:
+        known = len(positional)
+        profiled_old = apply_diff_profile(old_data, profile, positional=positional)
+        profiled_new = apply_diff_profile(new_data, profile, positional=positional)
+        if len(positional) == known:
+            break
+    old_data, new_data = profiled_old, profiled_new
+
     if not old_data:  # Create
         flat_new = flatten_dict(new_data)
         for k, v in flat_new.items():
@@ -55,27 +156,70 @@ def compute_diff(old_data: Dict, new_data: Dict) -> Dict[str, list]:
         clean_key = clean_path(path)
         changes[clean_key] = [value, None]
 
-    for cat in ['iterable_item_added', 'iterable_item_removed', 'type_changes']:
-        for path, val in diff.get(cat, {}).items():
-            old = val.get('old_value') if isinstance(val, dict) else None
-            new = val.get('new_value') if isinstance(val, dict) else val
-            clean_key = clean_path(path)
-            changes[clean_key] = [old, new]
+    # With verbose_level=2 added/removed list items are reported as the item itself
+    for path, val in diff.get('iterable_item_added', {}).items():
+        changes[clean_path(path)] = [None, val]
+
+    for path, val in diff.get('iterable_item_removed', {}).items():
+        changes[clean_path(path)] = [val, None]
+
+    for path, val in diff.get('type_changes', {}).items():
+        changes[clean_path(path)] = [val.get('old_value'), val.get('new_value')]
 
     return changes
 
-def generate_summary(changes: Dict[str, list]) -> str:
+DEFAULT_SUMMARY_TEMPLATES = {
+    "set": "{field} set to {new}",
+    "removed": "{field} removed (was {old})",
+    "changed": "{field} changed from {old} to {new}",
+    "more": "{count} more field(s) changed",
+}
+
+
+def get_summary_templates(resource_type: str = None) -> Dict[str, str]:
+    """Default clause templates overlaid with AUDIT_SUMMARY_TEMPLATES[resource_type], if any."""
+    configured = getattr(settings, "AUDIT_SUMMARY_TEMPLATES", {})
+    templates = dict(DEFAULT_SUMMARY_TEMPLATES)
+    templates.update(configured.get("default", {}))
+    if resource_type:
+        templates.update(configured.get(resource_type, {}))
+    return templates
+
+
+def summary_is_lazy() -> bool:
+    """True when summaries are rendered on read instead of being stored at write time."""
+    return getattr(settings, "AUDIT_SUMMARY_MODE", "eager") == "lazy"
+
+
+def _shorten(value, max_length: int):
+    text = str(value)
+    if max_length and len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
+
+
+def generate_summary(changes: Dict[str, list], resource_type: str = None, max_fields: int = None) -> str:
     if not changes:
         return "No changes detected."
+    if max_fields is None:
+        max_fields = getattr(settings, "AUDIT_SUMMARY_MAX_FIELDS", 20)
+    max_value_length = getattr(settings, "AUDIT_SUMMARY_MAX_VALUE_LENGTH", 100)
+    templates = get_summary_templates(resource_type)
+
     parts = []
-    for key, (old, new) in changes.items():
+    for key, (old, new) in islice(changes.items(), max_fields or None):
         field = key  # already cleaned
+        old_text = _shorten(old, max_value_length)
+        new_text = _shorten(new, max_value_length)
         if old is None:
-            parts.append(f"{field} set to {new}")
+            parts.append(templates["set"].format(field=field, old=old_text, new=new_text))
         elif new is None:
-            parts.append(f"{field} removed (was {old})")
+            parts.append(templates["removed"].format(field=field, old=old_text, new=new_text))
         else:
-            parts.append(f"{field} changed from {old} to {new}")
+            parts.append(templates["changed"].format(field=field, old=old_text, new=new_text))
+    remaining = len(changes) - len(parts)
+    if remaining > 0:
+        parts.append(templates["more"].format(count=remaining))
     text = " and ".join(parts).capitalize()
     return text if text.endswith(".") else text + "."
 
@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Keys are uuid4().hex; anything else (e.g. "../x") could escape the blob directory
+CLAIM_CHECK_KEY = re.compile(r"[0-9a-f]{32}")
+
+
+class DiskBlobStore:
+    """Blobs as files in AUDIT_CLAIM_CHECK_DIR; producers and workers must share the directory"""
+    name = "disk"
+
+    def __init__(self):
+        self.directory = Path(getattr(settings, "AUDIT_CLAIM_CHECK_DIR", "/tmp/audit_claim_checks"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def put(self, key: str, body: bytes):
+        path = self.directory / key
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)  # readers never see a partially written blob
+
+    def get(self, key: str) -> bytes:
+        try:
+            return (self.directory / key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def delete(self, key: str):
+        (self.directory / key).unlink(missing_ok=True)
+
+    def collect_garbage(self, max_age_seconds: int) -> int:
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue  # fetched and deleted by a worker meanwhile
+        return removed
+
+
+class RedisBlobStore:
+    """Blobs as Redis keys that expire after AUDIT_CLAIM_CHECK_TTL_SECONDS"""
+    name = "redis"
+    prefix = "audit:claim_check:"
+
+    def __init__(self):
+        import redis
+        url = getattr(settings, "AUDIT_CLAIM_CHECK_REDIS_URL", None) or settings.CELERY_BROKER_URL
+        self.client = redis.Redis.from_url(url)
+        self.ttl = getattr(settings, "AUDIT_CLAIM_CHECK_TTL_SECONDS", 86400)
+
+    def put(self, key: str, body: bytes):
+        self.client.set(self.prefix + key, body, ex=self.ttl)
+
+    def get(self, key: str) -> bytes:
+        body = self.client.get(self.prefix + key)
+        if body is None:
+            raise KeyError(key)
+        return body
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def collect_garbage(self, max_age_seconds: int) -> int:
+        return 0  # Redis expires orphaned blobs through the key TTL
+
+
+BLOB_STORES = {
+    DiskBlobStore.name: DiskBlobStore,
+    RedisBlobStore.name: RedisBlobStore,
+}
+
+
+class ClaimCheckService:
+    """Service for moving large task payloads out of the broker message (claim-check pattern)"""
+
+    @staticmethod
+    def get_store(name: str = None):
+        name = name or getattr(settings, "AUDIT_CLAIM_CHECK_BACKEND", "disk")
+        return BLOB_STORES[name]()
+
+    @staticmethod
+    def store_if_large(payloads):
+        """
+        Put payloads into the blob store when their JSON size reaches the threshold.
+        
+        Args:
+            payloads: Single payload dict or list of payload dicts
+            
+        Returns:
+            Claim check reference ("<backend>:<key>") or None when the payload is small
+        """
+        threshold = getattr(settings, "AUDIT_CLAIM_CHECK_THRESHOLD_BYTES", 256 * 1024)
+        if not threshold:
+            return None
+        body = json.dumps(payloads).encode()
+        if len(body) < threshold:
+            return None
+
+        store = ClaimCheckService.get_store()
+        key = uuid.uuid4().hex
+        store.put(key, body)
+        logger.info(f"Payload of {len(body)} bytes stored as claim check {store.name}:{key}")
+        return f"{store.name}:{key}"
+
+    @staticmethod
+    def parse_ref(ref: str):
+        """
+        Split a claim check reference into its blob store and key.
+
+        Raises:
+            KeyError: If the reference does not name a known backend and a generated key
+        """
+        name, _, key = str(ref).partition(":")
+        if name not in BLOB_STORES or not CLAIM_CHECK_KEY.fullmatch(key):
+            raise KeyError(ref)
+        return ClaimCheckService.get_store(name), key
+
+    @staticmethod
+    def fetch(ref: str):
+        """Load the payloads for a claim check reference; raises KeyError if the blob is gone."""
+        store, key = ClaimCheckService.parse_ref(ref)
+        return json.loads(store.get(key))
+
+    @staticmethod
+    def delete(ref: str):
+        store, key = ClaimCheckService.parse_ref(ref)
+        store.delete(key)
+
+    @staticmethod
+    def collect_garbage() -> int:
+        """Remove blobs older than AUDIT_CLAIM_CHECK_TTL_SECONDS whose tasks never completed."""
+        ttl = getattr(settings, "AUDIT_CLAIM_CHECK_TTL_SECONDS", 86400)
+        return ClaimCheckService.get_store().collect_garbage(ttl)
@@ -0,0 +1,104 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Tuple
+import django
+from django.conf import settings
+from .audit_service import compute_diff, generate_summary
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def document_size(data) -> int:
+    """Number of scalar leaves in a JSON-like document - a cheap proxy for diff cost."""
+    size = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        else:
+            size += 1
+    return size
+
+
+def diff_and_summarize(old: Dict, new: Dict, res_type: str, with_summary: bool) -> Tuple[Dict, str]:
+    """Pure CPU work for one event; module level so it can be pickled into pool workers."""
+    changes = compute_diff(old, new, res_type)
+    summary = generate_summary(changes, res_type) if with_summary else ""
+    return changes, summary
+
+
+class DiffService:
+    """Service for computing diffs/summaries for a batch, optionally fanned out to a process pool"""
+
+    @staticmethod
+    def get_pool() -> ProcessPoolExecutor:
+        """Shared pool sized by AUDIT_DIFF_POOL_WORKERS (defaults to the CPU count)."""
+        global _pool
+        with _pool_lock:
+            if _pool is None:
+                workers = getattr(settings, "AUDIT_DIFF_POOL_WORKERS", None) or os.cpu_count()
+                # django.setup() so workers started with "spawn" can read settings too
+                _pool = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+            return _pool
+
+    @staticmethod
+    def shutdown_pool():
+        global _pool
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+                _pool = None
+
+    @staticmethod
+    def compute_many(items: List[Tuple[Dict, Dict, str]], with_summary: bool = True,
+                     executor: ProcessPoolExecutor = None) -> List[Tuple[Dict, str]]:
+        """
+        Compute (changes, summary) for independent (old, new, res_type) items.
+
+        With AUDIT_DIFF_PROCESS_POOL enabled (or an explicit executor), items whose combined
+        document size reaches AUDIT_DIFF_POOL_THRESHOLD leaves run in worker processes while
+        the small ones are computed inline.
+
+        Args:
+            items: List of (old data, new data, resource type) tuples
+            with_summary: Whether to generate summaries
+            executor: Process pool to use instead of the shared one
+
+        Returns:
+            List of (changes dict, summary string) in input order
+        """
+        if executor is None and getattr(settings, "AUDIT_DIFF_PROCESS_POOL", False):
+            executor = DiffService.get_pool()
+        threshold = getattr(settings, "AUDIT_DIFF_POOL_THRESHOLD", 500)
+
+        futures = {}
+        if executor is not None:
+            for i, (old, new, res_type) in enumerate(items):
+                if document_size(old) + document_size(new) >= threshold:
+                    futures[i] = executor.submit(diff_and_summarize, old, new, res_type, with_summary)
+            logger.info(f"Diffs sent to process pool: {len(futures)} of {len(items)}")
+
+        # Small items are computed inline while the pool works on the large ones
+        results = [None] * len(items)
+        for i, (old, new, res_type) in enumerate(items):
+            if i not in futures:
+                results[i] = diff_and_summarize(old, new, res_type, with_summary)
+
+        try:
+            for i, future in futures.items():
+                results[i] = future.result()
+        except BrokenProcessPool:
+            if executor is _pool:
+                DiffService.shutdown_pool()
+            raise
+
+        return results
@@ -0,0 +1,113 @@
+import logging
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "audit:history"
+
+# Sets KEYS[1] to ARGV[1] (with TTL ARGV[2]) unless it already holds a version at least as high.
+# Django's Redis serializer stores ints as plain numbers, so the pointer is readable with GET
+RAISE_VERSION_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if current == nil or current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Process-local hit/miss counters, e.g. {"latest:hit": 10, "latest:miss": 2}
+cache_metrics = Counter()
+
+
+class HistoryCache:
+    """Version-keyed cache primitives for AuditHistory reads.
+
+    Entries for a resource embed its current version (kept in a pointer key), so a write never
+    has to delete entries: bumping the pointer makes readers switch to fresh keys and the old
+    ones expire through their TTL. That also avoids a stampede of deletes/reloads on write.
+    """
+
+    @staticmethod
+    def get_cache():
+        return caches[getattr(settings, "AUDIT_HISTORY_CACHE_ALIAS", "redis")]
+
+    @staticmethod
+    def timeout() -> int:
+        return getattr(settings, "AUDIT_HISTORY_CACHE_TTL", 300)
+
+    @staticmethod
+    def version_key(res_type: str, res_id: str) -> str:
+        return f"{KEY_PREFIX}:ver:{res_type}:{res_id}"
+
+    @staticmethod
+    def get_or_load(kind: str, key: str, loader):
+        """Return the cached value for key, calling loader() and caching its result on a miss."""
+        cache = HistoryCache.get_cache()
+        value = cache.get(key)
+        if value is not None:
+            cache_metrics[f"{kind}:hit"] += 1
+            return value
+        cache_metrics[f"{kind}:miss"] += 1
+        value = loader()
+        if value is not None:
+            cache.set(key, value, HistoryCache.timeout())
+        return value
+
+    @staticmethod
+    def current_version(res_type: str, res_id: str, loader) -> int:
+        """Current version of a resource from its pointer key, loading it from the DB on a miss."""
+        cache = HistoryCache.get_cache()
+        key = HistoryCache.version_key(res_type, res_id)
+        version = cache.get(key)
+        if version is not None:
+            return version
+        version = loader() or 0
+        # add() never overwrites a newer version set by a concurrent write
+        cache.add(key, version, HistoryCache.timeout())
+        return version
+
+    @staticmethod
+    def bump_versions(histories):
+        """Point readers at the versions just written, once the writing transaction commits."""
+        latest = {}
+        for history in histories:
+            key = HistoryCache.version_key(history.resource_type, history.resource_id)
+            latest[key] = max(latest.get(key, 0), history.version)
+        if not latest:
+            return
+        # robust: the rows are committed either way, a cache outage must not fail the write
+        transaction.on_commit(lambda: HistoryCache.raise_versions(latest), robust=True)
+
+    @staticmethod
+    def raise_versions(versions: dict):
+        """
+        Move version pointers forward only, so concurrent commits landing out of order
+        never point readers back at an older version.
+
+        Args:
+            versions: Dict mapping version keys to the versions just written
+        """
+        cache = HistoryCache.get_cache()
+        timeout = HistoryCache.timeout()
+        if isinstance(cache, RedisCache):
+            script = None
+            for key, version in versions.items():
+                cache_key = cache.make_and_validate_key(key)
+                client = cache._cache.get_client(cache_key, write=True)
+                script = script or client.register_script(RAISE_VERSION_SCRIPT)
+                script(keys=[cache_key], args=[version, timeout], client=client)
+            return
+        # Other backends have no compare-and-set; fine for a single process (tests, local runs)
+        for key, version in versions.items():
+            current = cache.get(key)
+            if current is None or current < version:
+                cache.set(key, version, timeout)
+
+    @staticmethod
+    def metrics() -> dict:
+        return dict(cache_metrics)
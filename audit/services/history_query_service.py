@@ -0,0 +1,96 @@
+from ..models import AuditHistory
+from .history_cache import KEY_PREFIX, HistoryCache
+from .response_service import ResponseService
+
+
+class HistoryQueryService:
+    """Service for read-through cached AuditHistory queries"""
+
+    @staticmethod
+    def _current_version(res_type: str, res_id: str) -> int:
+        return HistoryCache.current_version(
+            res_type, res_id,
+            lambda: AuditHistory.objects.filter(
+                resource_type=res_type, resource_id=res_id
+            ).order_by('-version').values_list('version', flat=True).first()
+        )
+
+    @staticmethod
+    def get_latest(res_type: str, res_id: str):
+        """
+        Get the latest version of a resource.
+        
+        Args:
+            res_type: Resource type
+            res_id: Resource ID
+            
+        Returns:
+            History item dict or None
+        """
+        version = HistoryQueryService._current_version(res_type, res_id)
+        if not version:
+            return None
+        return HistoryCache.get_or_load(
+            "latest",
+            f"{KEY_PREFIX}:latest:{res_type}:{res_id}:v{version}",
+            lambda: HistoryQueryService._load_version(res_type, res_id, version),
+        )
+
+    @staticmethod
+    def get_page(res_type: str, res_id: str, cursor: int = None, limit: int = 20) -> dict:
+        """
+        Get a page of a resource's history, newest first.
+        
+        Args:
+            res_type: Resource type
+            res_id: Resource ID
+            cursor: Return versions below this one (None for the first page)
+            limit: Page size
+            
+        Returns:
+            Dict with 'results' and 'next_cursor' (None on the last page)
+        """
+        version = HistoryQueryService._current_version(res_type, res_id)
+        return HistoryCache.get_or_load(
+            "page",
+            f"{KEY_PREFIX}:page:{res_type}:{res_id}:v{version}:{cursor}:{limit}",
+            lambda: HistoryQueryService._load_page(res_type, res_id, cursor, limit),
+        )
+
+    @staticmethod
+    def get_event(event_id: str):
+        """
+        Get a history record by event id; records are immutable so entries are never invalidated.
+        
+        Args:
+            event_id: AuditHistory.event_id
+            
+        Returns:
+            History item dict or None
+        """
+        return HistoryCache.get_or_load(
+            "event",
+            f"{KEY_PREFIX}:event:{event_id}",
+            lambda: HistoryQueryService._build(AuditHistory.objects.filter(event_id=event_id).first()),
+        )
+
+    @staticmethod
+    def _build(history):
+        return ResponseService.build_history_item(history) if history else None
+
+    @staticmethod
+    def _load_version(res_type: str, res_id: str, version: int):
+        return HistoryQueryService._build(
+            AuditHistory.objects.filter(resource_type=res_type, resource_id=res_id, version=version).first()
+        )
+
+    @staticmethod
+    def _load_page(res_type: str, res_id: str, cursor: int, limit: int) -> dict:
+        qs = AuditHistory.objects.filter(resource_type=res_type, resource_id=res_id)
+        if cursor:
+            qs = qs.filter(version__lt=cursor)
+        histories = list(qs.order_by('-version').defer('search_vector')[:limit])
+        return {
+            "results": [ResponseService.build_history_item(history) for history in histories],
+            "next_cursor": histories[-1].version if histories and len(histories) == limit else None,
+        }
@@ -1,61 +1,90 @@
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Max, Q
 from django.utils import timezone
 from ..models import AuditHistory
+from .history_cache import HistoryCache
+from .rollup_service import RollupService
+
+LOOKUP_CHUNK_SIZE = 500
 
 
 class HistoryService:
     """Service for database operations on AuditHistory - business logic moved from ActivityInteractor"""
 
     @staticmethod
-    def get_last_history(res_type: str, res_id: str):
+    def get_last_histories(keys) -> dict:
         """
-        Get the last AuditHistory record for a resource.
+        Get the last AuditHistory record for many resources with batched queries.
         
         Args:
-            res_type: Resource type
-            res_id: Resource ID
+            keys: Iterable of (resource_type, resource_id) tuples
             
         Returns:
-            AuditHistory object or None
+            Dict mapping (resource_type, resource_id) to AuditHistory (missing when none exists)
         """
-        return AuditHistory.objects.filter(
-            resource_type=res_type,
-            resource_id=res_id
-        ).order_by('-version').first()
+        keys = list(set(keys))
+        result = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+            match = Q()
+            for res_type, res_id in chunk:
+                match |= Q(resource_type=res_type, resource_id=res_id)
+            latest = AuditHistory.objects.filter(match).values('resource_type', 'resource_id').annotate(
+                max_version=Max('version')
+            ).order_by()
+
+            version_match = Q()
+            for row in latest:
+                version_match |= Q(
+                    resource_type=row['resource_type'],
+                    resource_id=row['resource_id'],
+                    version=row['max_version'],
+                )
+            if not version_match:
+                continue
+            for history in AuditHistory.objects.filter(version_match):
+                result[(history.resource_type, history.resource_id)] = history
+        return result
 
     @staticmethod
-    def create_history(res_type: str, res_id: str, operation: str, actor_full: dict, 
-                       actor_id: str, changes: dict, summary: str, data: dict, last_version: int = None):
+    def bulk_create_histories(records: list) -> list:
         """
-        Create a new AuditHistory record.
+        Create many AuditHistory records in one transaction.
         
         Args:
-            res_type: Resource type
-            res_id: Resource ID
-            operation: Operation type (created, updated, deleted)
-            actor_full: Full actor information dict
-            actor_id: Actor ID string
-            changes: Dictionary of changes
-            summary: Summary string
-            data: Full fields after dict
-            last_version: Previous version number (if exists)
+            records: List of dicts with res_type, res_id, version, operation, actor_full,
+                actor_id, changes, summary and data (full fields after), in event order
             
         Returns:
-            Created AuditHistory object
+            List of created AuditHistory objects
         """
-        version = (last_version + 1) if last_version else 1
-        now = timezone.now()
-        
-        return AuditHistory.objects.create(
-            resource_type=res_type,
-            resource_id=res_id,
-            version=version,
-            operation=operation,
-            actor=actor_full,
-            actor_id=actor_id,
-            changes=changes,
-            summary=summary,
-            full_fields_after=data,
-            timestamp=now,
-        )
+        objs = []
+        last_timestamp = {}
+        for record in records:
+            key = (record["res_type"], record["res_id"])
+            now = timezone.now()
+            # Versions of a resource repeated in the batch keep distinct, increasing timestamps
+            if key in last_timestamp and now <= last_timestamp[key]:
+                now = last_timestamp[key] + timedelta(microseconds=1)
+            last_timestamp[key] = now
+            objs.append(AuditHistory(
+                resource_type=record["res_type"],
+                resource_id=record["res_id"],
+                version=record["version"],
+                operation=record["operation"],
+                actor=record["actor_full"],
+                actor_id=record["actor_id"],
+                changes=record["changes"],
+                summary=record["summary"],
+                full_fields_after=record["data"],
+                timestamp=now,
+            ))
+        with transaction.atomic():
+            histories = AuditHistory.objects.bulk_create(objs, batch_size=1000)
+            # Rollup deltas commit together with the rows they count
+            RollupService.record(histories)
+            HistoryCache.bump_versions(histories)
+        return histories
     print("task_completed")
 
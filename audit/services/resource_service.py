@@ -1,6 +1,7 @@
 import uuid
 from typing import Dict, Any
 from ..schemas import FlatActivity
+from .audit_service import apply_diff_profile, get_diff_profile
 
 
 class ResourceService:
@@ -57,5 +58,8 @@ class ResourceService:
         data.pop("id", None)
         data.pop("type", None)
 
+        # Drop ignored paths and collapse opaque subtrees before the document is stored
+        data = apply_diff_profile(data, get_diff_profile(res_type), for_diff=False)
+
         return res_id, res_type, data
 
@@ -18,7 +18,7 @@ class ResponseService:
             res_id: Resource ID string
             res_type: Resource type string
             changes: Dictionary of changes
-            summary: Summary string
+            summary: Summary string, or None when it is rendered on read
             
         Returns:
             Response dictionary
@@ -42,3 +42,43 @@ class ResponseService:
             "updated_at": now.isoformat()
         }
 
+    @staticmethod
+    def build_minimal_response(history) -> dict:
+        """
+        Build an acknowledgement-only response dictionary.
+        
+        Args:
+            history: Created AuditHistory object
+            
+        Returns:
+            Response dictionary with event id, version and number of changed fields
+        """
+        return {
+            "event_id": str(history.event_id),
+            "version": history.version,
+            "change_count": len(history.changes),
+        }
+
+    @staticmethod
+    def build_history_item(history) -> dict:
+        """
+        Build the read representation of a stored history record.
+        
+        Args:
+            history: AuditHistory object
+            
+        Returns:
+            History item dictionary
+        """
+        return {
+            "event_id": str(history.event_id),
+            "resource_type": history.resource_type,
+            "resource_id": history.resource_id,
+            "version": history.version,
+            "operation": history.operation,
+            "actor": history.actor,
+            "changes": history.changes,
+            "description": history.get_summary(),
+            "fields": history.full_fields_after,
+            "timestamp": history.timestamp.isoformat(),
+        }
@@ -0,0 +1,172 @@
+import time
+from collections import Counter
+from datetime import datetime
+from django.conf import settings
+from django.db import connection, transaction
+from ..models import ActivityRollup, ActivityRollupDelta
+
+# Postgres advisory lock key held by the refresher folding deltas
+ROLLUP_LOCK_ID = 0x726F6C6C  # "roll"
+
+
+class RollupService:
+    """Service for maintaining and reading ActivityRollup counts"""
+
+    @staticmethod
+    def truncate(ts: datetime, granularity: str) -> datetime:
+        """Truncate a timestamp to the start of its hour/day bucket."""
+        ts = ts.replace(minute=0, second=0, microsecond=0)
+        if granularity == ActivityRollup.GRANULARITY_DAY:
+            ts = ts.replace(hour=0)
+        return ts
+
+    @staticmethod
+    def record(histories):
+        """
+        Queue hourly counts for newly created histories as ActivityRollupDelta rows.
+
+        Must run inside the transaction that inserts the histories, so the deltas become
+        visible exactly when the rows they count commit (or vanish with them on rollback).
+
+        Args:
+            histories: AuditHistory objects being created
+        """
+        by_actor = getattr(settings, "AUDIT_ROLLUP_BY_ACTOR", False)
+        counts = Counter()
+        for history in histories:
+            bucket = RollupService.truncate(history.timestamp, ActivityRollup.GRANULARITY_HOUR)
+            actor_id = (history.actor_id or "") if by_actor else ""
+            counts[(bucket, history.resource_type, history.operation, actor_id)] += 1
+        ActivityRollupDelta.objects.bulk_create([
+            ActivityRollupDelta(bucket=bucket, resource_type=res_type, operation=operation, actor_id=actor_id, count=n)
+            for (bucket, res_type, operation, actor_id), n in counts.items()
+        ], batch_size=1000)
+
+    @staticmethod
+    def refresh(batch_size: int = None, time_budget: float = None) -> int:
+        """
+        Fold pending ActivityRollupDelta rows into the rollup table until none are left
+        or the time budget runs out.
+
+        Args:
+            batch_size: Maximum number of delta rows per transaction (AUDIT_ROLLUP_BATCH_SIZE)
+            time_budget: Seconds after which no new chunk is started (AUDIT_ROLLUP_TIME_BUDGET_SECONDS)
+
+        Returns:
+            Number of history rows folded in
+        """
+        batch_size = batch_size or getattr(settings, "AUDIT_ROLLUP_BATCH_SIZE", 5000)
+        if time_budget is None:
+            time_budget = getattr(settings, "AUDIT_ROLLUP_TIME_BUDGET_SECONDS", 50)
+        deadline = time.monotonic() + time_budget
+
+        processed = 0
+        while True:
+            folded, deltas = RollupService.refresh_chunk(batch_size)
+            processed += folded
+            if deltas < batch_size or time.monotonic() >= deadline:
+                return processed
+
+    @staticmethod
+    def refresh_chunk(batch_size: int):
+        """
+        Fold up to batch_size pending deltas in one transaction and delete them.
+
+        Returns:
+            Tuple of (history rows folded in, delta rows consumed); (0, 0) when another
+            refresher holds the lock
+        """
+        with transaction.atomic():
+            # Serialises refreshers so rollup counts are never read-modify-written concurrently
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [ROLLUP_LOCK_ID])
+                if not cursor.fetchone()[0]:
+                    return 0, 0
+
+            deltas = list(ActivityRollupDelta.objects.order_by("id").values_list(
+                "id", "bucket", "resource_type", "operation", "actor_id", "count"
+            )[:batch_size])
+            if not deltas:
+                return 0, 0
+
+            counts = Counter()
+            folded = 0
+            for _, bucket, res_type, operation, actor_id, n in deltas:
+                for granularity, _ in ActivityRollup.GRANULARITY_CHOICES:
+                    bucket_start = RollupService.truncate(bucket, granularity)
+                    counts[(granularity, bucket_start, res_type, operation, "")] += n
+                    if actor_id:
+                        counts[(granularity, bucket_start, res_type, operation, actor_id)] += n
+                folded += n
+
+            RollupService._apply_counts(counts)
+            ActivityRollupDelta.objects.filter(id__in=[delta[0] for delta in deltas]).delete()
+
+        return folded, len(deltas)
+
+    @staticmethod
+    def _apply_counts(counts: Counter):
+        """Add counts to existing rollup rows (bulk_update) and insert missing ones (bulk_create)."""
+        buckets = {key[1] for key in counts}
+        existing = {
+            (r.granularity, r.bucket, r.resource_type, r.operation, r.actor_id): r
+            for r in ActivityRollup.objects.filter(bucket__in=buckets)
+        }
+        to_update, to_create = [], []
+        for key, n in counts.items():
+            rollup = existing.get(key)
+            if rollup:
+                rollup.count += n
+                to_update.append(rollup)
+            else:
+                granularity, bucket, res_type, operation, actor_id = key
+                to_create.append(ActivityRollup(
+                    granularity=granularity,
+                    bucket=bucket,
+                    resource_type=res_type,
+                    operation=operation,
+                    actor_id=actor_id,
+                    count=n,
+                ))
+        ActivityRollup.objects.bulk_update(to_update, ["count"], batch_size=1000)
+        ActivityRollup.objects.bulk_create(to_create, batch_size=1000)
+
+    @staticmethod
+    def get_stats(granularity: str, start: datetime, end: datetime, resource_type: str = None,
+                  operation: str = None, actor_id: str = None) -> list:
+        """
+        Read rollup counts for a time range.
+
+        Args:
+            granularity: "hour" or "day"
+            start: Inclusive range start
+            end: Exclusive range end
+            resource_type: Optional resource type filter
+            operation: Optional operation filter
+            actor_id: Optional actor filter (requires AUDIT_ROLLUP_BY_ACTOR)
+
+        Returns:
+            List of dicts with bucket, resource_type, operation and count
+        """
+        qs = ActivityRollup.objects.filter(
+            granularity=granularity,
+            actor_id=actor_id or "",
+            bucket__gte=start,
+            bucket__lt=end,
+        )
+        if resource_type:
+            qs = qs.filter(resource_type=resource_type)
+        if operation:
+            qs = qs.filter(operation=operation)
+
+        return [
+            {
+                "bucket": bucket.isoformat(),
+                "resource_type": res_type,
+                "operation": op,
+                "count": count,
+            }
+            for bucket, res_type, op, count in qs.order_by("bucket", "resource_type", "operation").values_list(
+                "bucket", "resource_type", "operation", "count"
+            )
+        ]
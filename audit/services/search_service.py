@@ -0,0 +1,48 @@
+from datetime import datetime
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from ..models import AuditHistory
+
+
+class SearchService:
+    """Service for full-text search over AuditHistory summaries and changed values"""
+
+    @staticmethod
+    def search(query: str, resource_type: str = None, start: datetime = None, end: datetime = None,
+               limit: int = 50) -> list:
+        """
+        Ranked full-text search using the GIN indexed search_vector.
+        
+        Args:
+            query: Free text in web search syntax ("email changed", "foo@example.com", -deleted)
+            resource_type: Optional resource type filter
+            start: Optional inclusive timestamp lower bound
+            end: Optional exclusive timestamp upper bound
+            limit: Maximum number of results
+            
+        Returns:
+            List of result dicts ordered by rank, newest first on ties
+        """
+        search_query = SearchQuery(query, search_type="websearch", config="english")
+        qs = AuditHistory.objects.filter(search_vector=search_query)
+        if resource_type:
+            qs = qs.filter(resource_type=resource_type)
+        if start:
+            qs = qs.filter(timestamp__gte=start)
+        if end:
+            qs = qs.filter(timestamp__lt=end)
+
+        qs = qs.annotate(rank=SearchRank(F("search_vector"), search_query)).order_by("-rank", "-timestamp")
+        return [
+            {
+                "event_id": str(history.event_id),
+                "resource_type": history.resource_type,
+                "resource_id": history.resource_id,
+                "version": history.version,
+                "operation": history.operation,
+                "timestamp": history.timestamp.isoformat(),
+                "summary": history.get_summary(),
+                "rank": history.rank,
+            }
+            for history in qs.defer("full_fields_after", "search_vector")[:limit]
+        ]
@@ -1,17 +1,52 @@
 import logging
 from celery import shared_task
+from django.conf import settings
 from .interactors.activity_interactor import ActivityInteractor
+from .services.claim_check_service import ClaimCheckService
+from .services.rollup_service import RollupService
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, max_retries=2, queue="audit_log_queue")
-def process_activity_task(self, payloads):
+def process_activity_task(self, payloads=None, claim_check=None):
     try:
+        if claim_check:
+            payloads = ClaimCheckService.fetch(claim_check)
         result = ActivityInteractor.process_payloads(payloads)
+        if claim_check:
+            ClaimCheckService.delete(claim_check)
         logger.info(f"Activity processing completed successfully. Result: {result}")
+        if getattr(settings, "AUDIT_ROLLUP_ON_INGEST", False):
+            refresh_activity_rollups_task.delay()
         return result
     except Exception as exc:
         logger.error(f"Activity processing failed: {exc}")
         raise self.retry(exc=exc, countdown=20)
 
+
+def enqueue_activity(payloads):
+    """
+    Send payloads to process_activity_task, passing a claim check reference instead of
+    the body when it reaches AUDIT_CLAIM_CHECK_THRESHOLD_BYTES.
+    """
+    claim_check = ClaimCheckService.store_if_large(payloads)
+    if claim_check:
+        return process_activity_task.delay(claim_check=claim_check)
+    return process_activity_task.delay(payloads)
+
+
+@shared_task(queue="audit_log_queue")
+def refresh_activity_rollups_task():
+    """Periodic (Celery beat) task folding pending rollup deltas into ActivityRollup."""
+    processed = RollupService.refresh()
+    logger.info(f"Activity rollups refreshed. Rows processed: {processed}")
+    return processed
+
+
+@shared_task(queue="audit_log_queue")
+def collect_claim_check_garbage_task():
+    """Periodic (Celery beat) task removing orphaned claim check blobs."""
+    removed = ClaimCheckService.collect_garbage()
+    logger.info(f"Claim check garbage collected. Blobs removed: {removed}")
+    return removed
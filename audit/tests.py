@@ -1,3 +1,520 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, OperationalError
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .interactors.activity_interactor import ActivityInteractor
+from .interactors.micro_batcher import MicroBatcher
+from .management.commands.consume_activity_batches import Command as ConsumeActivityBatchesCommand
+from .management.commands.replay_activity import percentile
+from .models import ActivityRollup, ActivityRollupDelta, AuditHistory
+from .renderers import FastJSONParser, FastJSONRenderer
+from .services.audit_service import compute_diff, generate_summary, get_diff_profile
+from .services.claim_check_service import ClaimCheckService
+from .services.history_cache import HistoryCache
+from .services.history_query_service import HistoryQueryService
+from .services.rollup_service import RollupService
+from .services.search_service import SearchService
+from .tasks import process_activity_task, refresh_activity_rollups_task
+
+
+def user_payload(verb, **fields):
+    return {"actor": {"id": "12"}, "verb": verb, "object": {"id": "user-1", "type": "user", **fields}}
+
+
+class SummaryTests(TestCase):
+
+    def post(self, payload, query=""):
+        return APIClient().post(f"/audit/activity-stream/{query}", payload, format="json")
+
+    @override_settings(AUDIT_SUMMARY_MAX_FIELDS=2)
+    def test_clauses_are_capped_with_a_more_clause(self):
+        summary = generate_summary({"a": [None, 1], "b": [1, 2], "c": [3, None], "d": [None, 4]})
+
+        self.assertEqual(summary, "A set to 1 and b changed from 1 to 2 and 2 more field(s) changed.")
+
+    @override_settings(AUDIT_SUMMARY_MAX_VALUE_LENGTH=5)
+    def test_long_values_are_truncated(self):
+        self.assertEqual(generate_summary({"bio": [None, "abcdefghij"]}), "Bio set to abcde...")
+
+    @override_settings(AUDIT_SUMMARY_TEMPLATES={
+        "default": {"set": "{field} := {new}"},
+        "user": {"changed": "{field}: {old} -> {new}"},
+    })
+    def test_default_and_per_type_templates(self):
+        changes = {"email": ["a@example.com", "b@example.com"], "age": [None, 21]}
+
+        self.assertEqual(generate_summary(changes, "user"), "Email: a@example.com -> b@example.com and age := 21.")
+        self.assertEqual(generate_summary(changes, "order"),
+                         "Email changed from a@example.com to b@example.com and age := 21.")
+
+    @override_settings(AUDIT_SUMMARY_MODE="lazy")
+    def test_lazy_mode_stores_empty_summary_and_renders_on_read(self):
+        response = self.post(user_payload("create", email="a@example.com"))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.json()[0]["description"])
+        history = AuditHistory.objects.get()
+        self.assertEqual(history.summary, "")
+        self.assertEqual(history.get_summary(), "Email set to a@example.com.")
+
+    @override_settings(AUDIT_SUMMARY_MODE="lazy")
+    def test_summary_param_overrides_the_mode(self):
+        response = self.post(user_payload("create", email="a@example.com"), "?summary=true")
+
+        self.assertEqual(response.json()[0]["description"], "Email set to a@example.com.")
+        self.assertEqual(AuditHistory.objects.get().summary, "")
+
+    def test_summary_param_can_hide_eager_summaries(self):
+        response = self.post(user_payload("create", email="a@example.com"), "?summary=false")
+
+        self.assertIsNone(response.json()[0]["description"])
+        self.assertEqual(AuditHistory.objects.get().summary, "Email set to a@example.com.")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    AUDIT_HISTORY_CACHE_ALIAS="default",
+)
+class HistoryCacheTests(TestCase):
+
+    def setUp(self):
+        caches["default"].clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            ActivityInteractor.process_payloads(user_payload("create", email="old@example.com"))
+
+    def write_update(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            ActivityInteractor.process_payloads(user_payload("update", **fields))
+
+    def test_repeated_reads_hit_the_cache(self):
+        HistoryQueryService.get_latest("user", "user-1")
+        before = HistoryCache.metrics().get("latest:hit", 0)
+
+        with self.assertNumQueries(0):
+            latest = HistoryQueryService.get_latest("user", "user-1")
+
+        self.assertEqual(latest["version"], 1)
+        self.assertEqual(HistoryCache.metrics()["latest:hit"], before + 1)
+
+    def test_no_stale_reads_after_write(self):
+        latest = HistoryQueryService.get_latest("user", "user-1")
+        page = HistoryQueryService.get_page("user", "user-1")
+        event = HistoryQueryService.get_event(latest["event_id"])
+        self.assertEqual(latest["fields"]["email"], "old@example.com")
+        self.assertEqual(len(page["results"]), 1)
+
+        self.write_update(email="new@example.com")
+
+        latest = HistoryQueryService.get_latest("user", "user-1")
+        page = HistoryQueryService.get_page("user", "user-1")
+        self.assertEqual(latest["version"], 2)
+        self.assertEqual(latest["fields"]["email"], "new@example.com")
+        self.assertEqual([item["version"] for item in page["results"]], [2, 1])
+        # Records are immutable, so the cached point lookup stays valid
+        self.assertEqual(HistoryQueryService.get_event(event["event_id"]), event)
+
+    def test_invalid_page_params_are_rejected(self):
+        client = APIClient()
+        for query in ({"limit": "0"}, {"limit": "-1"}, {"cursor": "0"}, {"cursor": "-3"}, {"limit": "x"}):
+            response = client.get("/audit/history/", {"resource_type": "user", "resource_id": "user-1", **query})
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_version_pointer_only_moves_forward(self):
+        key = HistoryCache.version_key("user", "user-1")
+
+        HistoryCache.raise_versions({key: 3})
+        HistoryCache.raise_versions({key: 2})  # an older commit landing late
+
+        self.assertEqual(caches["default"].get(key), 3)
+
+    def test_cache_outage_does_not_fail_committed_write(self):
+        with mock.patch.object(HistoryCache, "raise_versions", side_effect=ConnectionError("redis down")):
+            with self.assertLogs("django.test", "ERROR"):
+                self.write_update(email="new@example.com")
+
+        self.assertEqual(AuditHistory.objects.filter(resource_id="user-1").count(), 2)
+
+    def test_cursor_pages(self):
+        self.write_update(email="a@example.com")
+        self.write_update(email="b@example.com")
+
+        first = HistoryQueryService.get_page("user", "user-1", limit=2)
+        second = HistoryQueryService.get_page("user", "user-1", cursor=first["next_cursor"], limit=2)
+
+        self.assertEqual([item["version"] for item in first["results"]], [3, 2])
+        self.assertEqual([item["version"] for item in second["results"]], [1])
+        self.assertIsNone(second["next_cursor"])
+
+
+class FastJSONTests(SimpleTestCase):
+
+    def test_integers_beyond_64_bits_round_trip_exactly(self):
+        big = 123456789012345678901234567890
+        body = b'{"object": {"id": "user-1", "balance": 123456789012345678901234567890, "ratio": 0.5}}'
+
+        data = FastJSONParser().parse(io.BytesIO(body))
+
+        self.assertEqual(data["object"]["balance"], big)
+        self.assertIsInstance(data["object"]["balance"], int)
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), data)
+
+    def test_regular_body(self):
+        data = FastJSONParser().parse(io.BytesIO(b'{"object": {"id": "user-1", "age": 21}}'))
+
+        self.assertEqual(data, {"object": {"id": "user-1", "age": 21}})
+
+
+class ReplayPercentileTests(SimpleTestCase):
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual([percentile(values, pct) for pct in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class ActivityResponseModeTests(TestCase):
+
+    def post(self, payload, query=""):
+        return APIClient().post(f"/audit/activity-stream/{query}", payload, format="json")
+
+    def test_minimal_response_acknowledges_each_event(self):
+        response = self.post([user_payload("create", email="a@example.com", age=21),
+                              user_payload("update", email="b@example.com", age=21)], "?response=minimal")
+
+        self.assertEqual(response.status_code, 201)
+        stored = {str(event_id): version for event_id, version in AuditHistory.objects.values_list("event_id", "version")}
+        self.assertEqual([set(item) for item in response.json()], [{"event_id", "version", "change_count"}] * 2)
+        self.assertEqual({item["event_id"]: item["version"] for item in response.json()}, stored)
+        self.assertEqual([item["change_count"] for item in response.json()], [2, 1])
+
+    def test_invalid_response_mode_is_rejected(self):
+        response = self.post(user_payload("create", email="a@example.com"), "?response=compact")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AuditHistory.objects.exists())
+
+
+class BatchWriteTests(TestCase):
+
+    def test_repeated_resource_gets_increasing_timestamps(self):
+        ActivityInteractor.process_payloads([user_payload("create", email="a@example.com"),
+                                             user_payload("update", email="b@example.com"),
+                                             user_payload("update", email="c@example.com")])
+
+        rows = list(AuditHistory.objects.order_by("version").values_list("version", "timestamp"))
+        self.assertEqual([version for version, _ in rows], [1, 2, 3])
+        self.assertTrue(rows[0][1] < rows[1][1] < rows[2][1])
+        self.assertEqual(AuditHistory.objects.get(version=3).full_fields_after["email"], "c@example.com")
+
+
+@override_settings(AUDIT_DIFF_PROFILES={
+    "user": {"ignore_paths": ["updated_at", "meta.etag"], "opaque_paths": ["avatar"], "list_key": "id"},
+})
+class DiffProfileTests(TestCase):
+
+    def test_ignored_paths_are_dropped_from_changes_and_stored_data(self):
+        ActivityInteractor.process_payloads(user_payload("create", email="a@example.com", updated_at="t1",
+                                                         meta={"etag": "e1", "source": "api"}))
+        ActivityInteractor.process_payloads(user_payload("update", email="b@example.com", updated_at="t2",
+                                                         meta={"etag": "e2", "source": "api"}))
+
+        latest = AuditHistory.objects.get(version=2)
+        self.assertEqual(latest.changes, {"email": ["a@example.com", "b@example.com"]})
+        self.assertNotIn("updated_at", latest.full_fields_after)
+        self.assertEqual(latest.full_fields_after["meta"], {"source": "api"})
+
+    def test_unchanged_opaque_subtree_produces_no_change(self):
+        avatar = {"url": "https://example.com/a.png", "sizes": [16, 32, 64]}
+        old = {"email": "a@example.com", "avatar": avatar}
+
+        self.assertEqual(compute_diff(old, {**old, "avatar": dict(avatar)}, "user"), {})
+        changes = compute_diff(old, {**old, "avatar": {**avatar, "sizes": [16]}}, "user")
+        self.assertEqual(list(changes), ["avatar"])
+        self.assertTrue(changes["avatar"][1].startswith("sha256:"))
+
+    def test_list_items_are_diffed_by_list_key(self):
+        old = {"roles": [{"id": "admin", "scope": "all"}, {"id": "viewer", "scope": "all"}]}
+        new = {"roles": [{"id": "viewer", "scope": "all"}, {"id": "admin", "scope": "billing"}]}
+
+        self.assertEqual(compute_diff(old, new, "user"), {"roles.admin.scope": ["all", "billing"]})
+
+    def test_list_with_repeated_keys_is_diffed_by_position(self):
+        old = {"roles": [{"id": "admin", "scope": "all"}, {"id": "admin", "scope": "billing"}]}
+        new = {"roles": [{"id": "admin", "scope": "billing"}]}
+
+        self.assertEqual(compute_diff(old, new, "user"), {"roles[0]": [{"id": "admin", "scope": "all"}, None]})
+
+    @override_settings(AUDIT_DIFF_PROFILES={"user": {"ignore_paths": ["items.*.seen"], "list_key": "id"}})
+    def test_ignored_paths_inside_lists_are_dropped_from_stored_data(self):
+        ActivityInteractor.process_payloads(user_payload("create", items=[{"id": 1, "n": 1, "seen": "t1"}]))
+        ActivityInteractor.process_payloads(user_payload("update", items=[{"id": 1, "n": 2, "seen": "t2"}]))
+
+        latest = AuditHistory.objects.get(version=2)
+        self.assertEqual(latest.full_fields_after["items"], [{"id": 1, "n": 2}])
+        self.assertEqual(latest.changes, {"items.1.n": [1, 2]})
+
+    def test_profiles_are_validated_once(self):
+        self.assertIs(get_diff_profile("user"), get_diff_profile("user"))
+        with self.assertRaises(ImproperlyConfigured):
+            with override_settings(AUDIT_DIFF_PROFILES={"user": {"max_depth": 0}}):
+                get_diff_profile("user")
+
+
+class FakeMessage:
+
+    def __init__(self):
+        self.state = None
+
+    def ack(self):
+        self.state = "acked"
+
+    def reject(self, requeue=False):
+        self.state = "requeued" if requeue else "rejected"
+
+
+@mock.patch("audit.interactors.micro_batcher.time.sleep")
+@mock.patch("audit.interactors.micro_batcher.close_old_connections")
+class MicroBatcherTests(TestCase):
+
+    def setUp(self):
+        self.batcher = MicroBatcher(max_events=100)
+
+    def test_invalid_message_is_rejected_and_good_one_acked(self, *mocks):
+        good, invalid = FakeMessage(), FakeMessage()
+        self.batcher.add(good, user_payload("create", email="a@example.com"))
+        self.batcher.add(invalid, {"actor": {"id": "12"}, "verb": "create", "object": {"id": "user-2"}})
+
+        self.batcher.flush()
+
+        self.assertEqual((good.state, invalid.state), ("acked", "rejected"))
+        self.assertEqual(AuditHistory.objects.count(), 1)
+
+    def test_db_error_requeues_with_backoff(self, close_connections, sleep):
+        good, other = FakeMessage(), FakeMessage()
+        self.batcher.add(good, user_payload("create", email="a@example.com"))
+        self.batcher.add(other, user_payload("update", email="b@example.com"))
+
+        with mock.patch.object(ActivityInteractor, "process_payloads", side_effect=OperationalError("db down")):
+            self.batcher.flush()
+
+        self.assertEqual((good.state, other.state), ("requeued", "requeued"))
+        self.assertEqual(self.batcher.stats["failed_messages"], 0)
+        sleep.assert_called_once_with(1)
+        close_connections.assert_called_once()
+
+    def test_db_error_while_isolating_messages_requeues(self, *mocks):
+        first, second = FakeMessage(), FakeMessage()
+        self.batcher.add(first, user_payload("create", email="a@example.com"))
+        self.batcher.add(second, user_payload("update", email="b@example.com"))
+
+        def process(payloads, **kwargs):
+            if len(payloads) > 1:
+                raise ValueError("invalid payload")
+            raise IntegrityError("duplicate version")
+
+        with mock.patch.object(ActivityInteractor, "process_payloads", side_effect=process):
+            self.batcher.flush()
+
+        self.assertEqual((first.state, second.state), ("requeued", "requeued"))
+        self.assertEqual(self.batcher.stats["requeued_messages"], 2)
+
+
+class ConsumeActivityBatchesTests(TestCase):
+
+    def test_buffered_messages_are_flushed_before_other_tasks_run(self):
+        command = ConsumeActivityBatchesCommand()
+        command.batcher = MicroBatcher(max_events=100)
+        buffered, task_message = FakeMessage(), FakeMessage()
+        command.on_message([[user_payload("create", email="a@example.com")], {}, {}],
+                           self.task_message(buffered, "audit.tasks.process_activity_task"))
+        seen = []
+
+        with mock.patch.object(refresh_activity_rollups_task, "run", side_effect=lambda: seen.append(buffered.state)):
+            command.on_message([[], {}, {}], self.task_message(task_message, "audit.tasks.refresh_activity_rollups_task"))
+
+        self.assertEqual(seen, ["acked"])
+        self.assertEqual(task_message.state, "acked")
+
+    @staticmethod
+    def task_message(message, task_name):
+        message.headers = {"task": task_name}
+        return message
+
+
+class ClaimCheckTests(TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        settings = override_settings(AUDIT_CLAIM_CHECK_BACKEND="disk", AUDIT_CLAIM_CHECK_DIR=self.directory,
+                                     AUDIT_CLAIM_CHECK_THRESHOLD_BYTES=200)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def blob_path(self, ref):
+        return self.directory / ref.split(":", 1)[1]
+
+    def test_only_payloads_reaching_the_threshold_are_stored(self):
+        self.assertIsNone(ClaimCheckService.store_if_large(user_payload("create", email="a@example.com")))
+
+        ref = ClaimCheckService.store_if_large(user_payload("create", bio="x" * 200))
+
+        self.assertRegex(ref, r"^disk:[0-9a-f]{32}$")
+        self.assertTrue(self.blob_path(ref).exists())
+
+    def test_task_processes_claim_checked_payload_and_deletes_blob(self):
+        payloads = [user_payload("create", bio="x" * 200)]
+        ref = ClaimCheckService.store_if_large(payloads)
+
+        process_activity_task(claim_check=ref)
+
+        self.assertEqual(AuditHistory.objects.get().full_fields_after["bio"], "x" * 200)
+        self.assertFalse(self.blob_path(ref).exists())
+
+    def test_collect_garbage_removes_only_old_blobs(self):
+        old_ref = ClaimCheckService.store_if_large(user_payload("create", bio="x" * 200))
+        new_ref = ClaimCheckService.store_if_large(user_payload("create", bio="y" * 200))
+        day_ago = time.time() - 2 * 86400
+        os.utime(self.blob_path(old_ref), (day_ago, day_ago))
+
+        with override_settings(AUDIT_CLAIM_CHECK_TTL_SECONDS=86400):
+            self.assertEqual(ClaimCheckService.collect_garbage(), 1)
+
+        self.assertFalse(self.blob_path(old_ref).exists())
+        self.assertTrue(self.blob_path(new_ref).exists())
+
+    def test_references_outside_the_blob_directory_are_rejected(self):
+        victim = self.directory.parent / f"{self.directory.name}-victim.json"
+        victim.write_text("[]")
+        self.addCleanup(victim.unlink, missing_ok=True)
+
+        for ref in (f"disk:../{victim.name}", "disk:", "unknown:" + "0" * 32, "no-separator"):
+            with self.assertRaises(KeyError):
+                ClaimCheckService.fetch(ref)
+            with self.assertRaises(KeyError):
+                ClaimCheckService.delete(ref)
+        self.assertTrue(victim.exists())
+
+
+class SearchTests(TestCase):
+
+    def create(self, resource_type, summary, changes, timestamp=None):
+        return AuditHistory.objects.create(
+            resource_type=resource_type, resource_id="r-1", version=AuditHistory.objects.count() + 1,
+            operation="updated", summary=summary, changes=changes,
+            timestamp=timestamp or datetime(2026, 2, 16, 12, tzinfo=dt_timezone.utc),
+        )
+
+    def search(self, query):
+        return APIClient().get("/audit/search/", {"q": "password", **query})
+
+    def test_trigger_indexes_summary_and_changed_values(self):
+        history = self.create("user", "Profile updated", {"email": ["old@example.com", "foo@example.com"]})
+
+        results = SearchService.search("foo@example.com")
+
+        self.assertEqual([item["event_id"] for item in results], [str(history.event_id)])
+        self.assertEqual(SearchService.search("profile")[0]["event_id"], str(history.event_id))
+
+        history.summary = "Avatar replaced"
+        history.save()
+        self.assertEqual(SearchService.search("profile"), [])
+
+    def test_summary_matches_rank_above_changes_matches(self):
+        in_changes = self.create("user", "Profile updated", {"note": ["", "password"]})
+        in_summary = self.create("user", "Password reset", {"note": ["", "password"]})
+
+        results = SearchService.search("password")
+
+        self.assertEqual([item["event_id"] for item in results], [str(in_summary.event_id), str(in_changes.event_id)])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+
+    def test_resource_type_and_time_filters(self):
+        early = self.create("user", "Password reset", {}, datetime(2026, 2, 1, tzinfo=dt_timezone.utc))
+        late = self.create("user", "Password reset", {}, datetime(2026, 2, 20, tzinfo=dt_timezone.utc))
+        self.create("order", "Password reset", {}, datetime(2026, 2, 20, tzinfo=dt_timezone.utc))
+
+        by_type = self.search({"resource_type": "user"}).json()
+        in_window = self.search({"resource_type": "user", "start": "2026-02-10T00:00:00Z",
+                                 "end": "2026-03-01T00:00:00Z"}).json()
+
+        self.assertEqual({item["event_id"] for item in by_type}, {str(early.event_id), str(late.event_id)})
+        self.assertEqual([item["event_id"] for item in in_window], [str(late.event_id)])
+
+    def test_limit_is_clamped(self):
+        for _ in range(3):
+            self.create("user", "Password reset", {})
+
+        response = self.search({"limit": "-1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+
+class RollupTests(TestCase):
+
+    def stats(self, granularity, resource_type="user"):
+        return RollupService.get_stats(
+            granularity, datetime(2000, 1, 1, tzinfo=dt_timezone.utc), datetime(2100, 1, 1, tzinfo=dt_timezone.utc),
+            resource_type=resource_type,
+        )
+
+    def test_truncate_buckets(self):
+        ts = datetime(2026, 2, 16, 11, 31, 39, 762704, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(RollupService.truncate(ts, ActivityRollup.GRANULARITY_HOUR),
+                         datetime(2026, 2, 16, 11, tzinfo=dt_timezone.utc))
+        self.assertEqual(RollupService.truncate(ts, ActivityRollup.GRANULARITY_DAY),
+                         datetime(2026, 2, 16, tzinfo=dt_timezone.utc))
+
+    def test_writes_queue_deltas_and_refresh_consumes_them(self):
+        ActivityInteractor.process_payloads([user_payload("create", email="a@example.com"),
+                                             user_payload("update", email="b@example.com")])
+        self.assertEqual(sum(ActivityRollupDelta.objects.values_list("count", flat=True)), 2)
+
+        self.assertEqual(RollupService.refresh(), 2)
+
+        self.assertFalse(ActivityRollupDelta.objects.exists())
+        hourly = self.stats(ActivityRollup.GRANULARITY_HOUR)
+        self.assertEqual({row["operation"]: row["count"] for row in hourly}, {"created": 1, "updated": 1})
+        # Nothing pending, so a second run folds nothing in
+        self.assertEqual(RollupService.refresh(), 0)
+        self.assertEqual(self.stats(ActivityRollup.GRANULARITY_HOUR), hourly)
+
+    def test_refresh_loops_over_chunks_until_caught_up(self):
+        for i in range(5):
+            ActivityInteractor.process_payloads(user_payload("update" if i else "create", email=f"{i}@example.com"))
+
+        self.assertEqual(RollupService.refresh(batch_size=2), 5)
+
+        self.assertFalse(ActivityRollupDelta.objects.exists())
+        self.assertEqual(sum(row["count"] for row in self.stats(ActivityRollup.GRANULARITY_DAY)), 5)
+
+    def test_apply_counts_merges_into_existing_rows(self):
+        bucket = datetime(2026, 2, 16, 11, tzinfo=dt_timezone.utc)
+        ActivityRollup.objects.create(granularity=ActivityRollup.GRANULARITY_HOUR, bucket=bucket,
+                                      resource_type="user", operation="updated", count=3)
+
+        RollupService._apply_counts(Counter({
+            (ActivityRollup.GRANULARITY_HOUR, bucket, "user", "updated", ""): 2,
+            (ActivityRollup.GRANULARITY_HOUR, bucket, "user", "created", ""): 1,
+        }))
+
+        counts = dict(ActivityRollup.objects.values_list("operation", "count"))
+        self.assertEqual(counts, {"updated": 5, "created": 1})
 
-# Create your tests here.
@@ -1,9 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ActivityStreamViewSet
+from .views import ActivityStreamViewSet, ActivityStatsViewSet, ActivitySearchViewSet, HistoryViewSet
 
 router = DefaultRouter()
 router.register(r'activity-stream', ActivityStreamViewSet, basename='activity-stream')
+router.register(r'activity-stats', ActivityStatsViewSet, basename='activity-stats')
+router.register(r'search', ActivitySearchViewSet, basename='activity-search')
+router.register(r'history', HistoryViewSet, basename='history')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,22 +1,178 @@
+import uuid
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from .interactors.activity_interactor import ActivityInteractor
+from .models import ActivityRollup
+from .renderers import FastJSONParser, FastJSONRenderer
+from .services.history_cache import HistoryCache
+from .services.history_query_service import HistoryQueryService
+from .services.rollup_service import RollupService
+from .services.search_service import SearchService
 
 class ActivityStreamViewSet(viewsets.ViewSet):
     """
     Handles activity stream POST requests (create audit events).
     Can be extended with GET/list methods later.
     """
+    # orjson backed JSON handling (falls back to DRF's json when orjson is missing)
+    parser_classes = [FastJSONParser, FormParser, MultiPartParser]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    response_modes = ("full", "minimal")
 
     def create(self, request):
         # Ensure payload is a list
         items = request.data if isinstance(request.data, list) else [request.data]
 
+        # ?response=minimal returns only event id, version and change count per item
+        response_mode = request.query_params.get("response", "full")
+        if response_mode not in self.response_modes:
+            return Response({"error": f"Invalid response mode: {response_mode}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ?summary=true|false overrides AUDIT_SUMMARY_MODE for the response description
+        summary_param = request.query_params.get("summary")
+        render_summary = None if summary_param is None else summary_param.lower() in ("1", "true", "yes")
+
         # Delegate processing to interactor
-        result = ActivityInteractor.process_payloads(items)
+        result = ActivityInteractor.process_payloads(
+            items, render_summary=render_summary, response_mode=response_mode
+        )
 
         # Check for validation errors returned by the interactor
         if result and "error" in result[0]:
             return Response(result[0], status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
         return Response(result, status=status.HTTP_201_CREATED)
+
+
+class ActivityStatsViewSet(viewsets.ViewSet):
+    """
+    Read-only activity counts served from the ActivityRollup table.
+    Query params: granularity (hour|day), start, end (ISO 8601), resource_type, operation, actor_id.
+    """
+
+    default_windows = {
+        ActivityRollup.GRANULARITY_HOUR: timedelta(hours=24),
+        ActivityRollup.GRANULARITY_DAY: timedelta(days=30),
+    }
+
+    def list(self, request):
+        params = request.query_params
+        granularity = params.get("granularity", ActivityRollup.GRANULARITY_HOUR)
+        if granularity not in self.default_windows:
+            return Response({"error": f"Invalid granularity: {granularity}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        end = parse_datetime(params["end"]) if params.get("end") else timezone.now()
+        start = parse_datetime(params["start"]) if params.get("start") else end - self.default_windows[granularity]
+        if start is None or end is None:
+            return Response({"error": "start/end must be ISO 8601 datetimes"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = RollupService.get_stats(
+            granularity=granularity,
+            start=start,
+            end=end,
+            resource_type=params.get("resource_type"),
+            operation=params.get("operation"),
+            actor_id=params.get("actor_id"),
+        )
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class ActivitySearchViewSet(viewsets.ViewSet):
+    """
+    Ranked full-text search over audit summaries and changed values.
+    Query params: q (required), resource_type, start, end (ISO 8601), limit (max 200).
+    """
+
+    max_limit = 200
+
+    def list(self, request):
+        params = request.query_params
+        query = params.get("q", "").strip()
+        if not query:
+            return Response({"error": "Query parameter 'q' is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        start = parse_datetime(params["start"]) if params.get("start") else None
+        end = parse_datetime(params["end"]) if params.get("end") else None
+        if (params.get("start") and start is None) or (params.get("end") and end is None):
+            return Response({"error": "start/end must be ISO 8601 datetimes"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = max(1, min(int(params.get("limit", 50)), self.max_limit))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = SearchService.search(
+            query,
+            resource_type=params.get("resource_type"),
+            start=start,
+            end=end,
+            limit=limit,
+        )
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class HistoryViewSet(viewsets.ViewSet):
+    """
+    Cached read access to audit history.
+    list:    ?resource_type=&resource_id=&cursor=&limit= (newest first, cursor = next_cursor of the previous page)
+    latest:  ?resource_type=&resource_id=
+    retrieve: /<event_id>/
+    """
+
+    lookup_field = "event_id"
+    max_limit = 100
+
+    @staticmethod
+    def resource_params(request):
+        res_type = request.query_params.get("resource_type")
+        res_id = request.query_params.get("resource_id")
+        if not res_type or not res_id:
+            return None, None, Response(
+                {"error": "Query parameters 'resource_type' and 'resource_id' are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return res_type, res_id, None
+
+    def list(self, request):
+        res_type, res_id, error = self.resource_params(request)
+        if error:
+            return error
+        try:
+            cursor = int(request.query_params["cursor"]) if request.query_params.get("cursor") else None
+            limit = min(int(request.query_params.get("limit", 20)), self.max_limit)
+        except ValueError:
+            return Response({"error": "cursor and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1 or (cursor is not None and cursor < 1):
+            return Response({"error": "cursor and limit must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = HistoryQueryService.get_page(res_type, res_id, cursor=cursor, limit=limit)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False)
+    def latest(self, request):
+        res_type, res_id, error = self.resource_params(request)
+        if error:
+            return error
+        result = HistoryQueryService.get_latest(res_type, res_id)
+        if result is None:
+            return Response({"error": "Resource not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, event_id=None):
+        try:
+            result = HistoryQueryService.get_event(str(uuid.UUID(event_id)))
+        except ValueError:
+            result = None
+        if result is None:
+            return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, url_path="cache-stats")
+    def cache_stats(self, request):
+        return Response(HistoryCache.metrics(), status=status.HTTP_200_OK)
@@ -122,6 +122,19 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -131,4 +144,66 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
-CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
\ No newline at end of file
+CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+CELERY_BEAT_SCHEDULE = {
+    "refresh-activity-rollups": {
+        "task": "audit.tasks.refresh_activity_rollups_task",
+        "schedule": 60.0,
+    },
+    "collect-claim-check-garbage": {
+        "task": "audit.tasks.collect_claim_check_garbage_task",
+        "schedule": 3600.0,
+    },
+}
+
+#Audit summary settings
+# "eager" stores the summary on write, "lazy" renders it from `changes` only when asked for
+AUDIT_SUMMARY_MODE = "eager"
+AUDIT_SUMMARY_MAX_FIELDS = 20
+AUDIT_SUMMARY_MAX_VALUE_LENGTH = 100
+# Per resource type clause templates ("set", "removed", "changed", "more"); "default" applies to all
+AUDIT_SUMMARY_TEMPLATES = {}
+
+#Audit rollup settings
+# Pending delta rows folded per transaction
+AUDIT_ROLLUP_BATCH_SIZE = 5000
+# A refresh keeps folding chunks until caught up or this many seconds have passed
+AUDIT_ROLLUP_TIME_BUDGET_SECONDS = 50
+# Also keep per-actor rollup rows
+AUDIT_ROLLUP_BY_ACTOR = False
+# Schedule a rollup refresh after every process_activity_task in addition to the beat schedule
+AUDIT_ROLLUP_ON_INGEST = False
+
+#Audit diff execution settings
+# Fan diff/summary computation for large documents out to a ProcessPoolExecutor
+AUDIT_DIFF_PROCESS_POOL = False
+AUDIT_DIFF_POOL_WORKERS = None  # defaults to os.cpu_count()
+# Leaf values (old + new) below which an event is diffed inline
+AUDIT_DIFF_POOL_THRESHOLD = 500
+
+#Audit diff profiles per resource type ("default" applies to types without a profile), e.g.
+# "user": {"ignore_paths": ["updated_at", "meta.etag"], "opaque_paths": ["avatar"],
+#          "max_depth": 4, "list_key": "id"}
+AUDIT_DIFF_PROFILES = {}
+
+#Audit micro-batching (python manage.py consume_activity_batches)
+AUDIT_MICROBATCH_MAX_EVENTS = 500
+AUDIT_MICROBATCH_MAX_WAIT_MS = 200
+# Transient failures (DB down, ...) requeue messages after an exponential back-off
+AUDIT_MICROBATCH_RETRY_BACKOFF_SECONDS = 1
+AUDIT_MICROBATCH_RETRY_BACKOFF_MAX_SECONDS = 60
+
+#Audit claim-check transport for large Celery payloads
+# Payloads whose JSON reaches this size go to the blob store, only a reference goes through the broker (0 disables)
+AUDIT_CLAIM_CHECK_THRESHOLD_BYTES = 256 * 1024
+# "disk" (directory shared by producers and workers) or "redis" (keys with TTL)
+AUDIT_CLAIM_CHECK_BACKEND = "disk"
+AUDIT_CLAIM_CHECK_DIR = BASE_DIR / "claim_checks"
+AUDIT_CLAIM_CHECK_REDIS_URL = CELERY_BROKER_URL
+# Blobs older than this are treated as orphaned
+AUDIT_CLAIM_CHECK_TTL_SECONDS = 24 * 60 * 60
+
+#Audit history read cache
+# Must be shared between writers (Celery/consumer) and the web processes, e.g. not LocMemCache
+AUDIT_HISTORY_CACHE_ALIAS = "redis"
+AUDIT_HISTORY_CACHE_TTL = 300